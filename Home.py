@@ -1,4 +1,12 @@
 import streamlit as st
+from unravel.warmup import start_warm_up
+
+
+# Preload the simulators once per server process while the visitor reads this page
+@st.cache_resource(show_spinner=False)
+def warm_up_simulators():
+    return start_warm_up()
+
 
 # Page Config
 st.set_page_config(page_title='Unravel Quantum', page_icon=":cat:", layout='wide')
@@ -6,6 +14,8 @@ st.set_page_config(page_title='Unravel Quantum', page_icon=":cat:", layout='wide
 
 st.title("UnravelQuantum")
 
+warm_up_simulators()
+
 st.write("""
     UnravelQuantum is your gateway to the world of quantum computing. Discover and explore quantum algorithms with ease, whether you're a newcomer or an experienced researcher. Dive into interactive tutorials, experiment with quantum circuits, and challenge yourself with quizzes. Join a vibrant community of quantum enthusiasts and embark on a quantum journey like never before.
 """)
@@ -1,161 +1,74 @@
 # ########## Import Initialization ############
-from qiskit import QuantumCircuit, transpile
-from qiskit_aer import AerSimulator
-from qiskit.providers.basic_provider import BasicProvider
-from qiskit.visualization import plot_histogram, circuit_drawer
-from qiskit_ibm_provider.job import job_monitor
-from qiskit_ibm_provider import IBMProvider
 import streamlit as st
-import matplotlib.pyplot as plt
-from random import choice
+from random import randrange
+from unravel.algorithms import oracle_style_key
+from unravel.deutsch_jozsa import generate_balanced_bitstring
+from unravel.gallery import GALLERY_SEEDS
+from unravel.stabilizer import ENGINE_QUBIT_LIMITS
+from unravel.ui import (
+    SEED_RANGE,
+    finish_page,
+    hardware_section,
+    keyed_circuit,
+    make_batch,
+    oracle_style_form,
+    pinned_spec,
+    profiling_sidebar,
+    reroll_seed,
+    run_section,
+    run_settings_form,
+    show_circuit_diagram,
+    show_oracle_check,
+)
 # #############################################
 
 
-# ########## Deustch Josza Algorithm ##########
-def generate_bitstring(n):
-    return "".join(choice("01") for _ in range(n))
-
-def ConstantFunctionOracle(n, output):
-    oracle = QuantumCircuit(n + 1)  # n input qubits, 1 ancillia qubit for |->
-    if output == 0:
-        return oracle
-    elif output == 1:
-        # Performing X on all qubits except one qubit(k) is computationally same as performing X only on one qubit(k)
-        oracle.x(n)
-        return oracle
-    else:
-        return "Error: Invalid function output"
-
-def BalancedFunctionOracle(n):
-    xGatesString = cxGatesString = generate_bitstring(n)
-    if len(xGatesString) != n:
-        return "Error: Invalid length of X Gate String"
-    if len(cxGatesString) != n:
-        return "Error: Invalid length of CX Gate String"
-
-    oracle = QuantumCircuit(n + 1)  # n input qubits, 1 ancillia qubit for |->
-
-    # Place X-gates before implementing CX gates in the next loop
-    for i in range(n):
-        if xGatesString[i] == "1":
-            oracle.x(i)
-
-    # Place CX-gates to give phase at desired combinations
-    for m in range(n):
-        if cxGatesString[m] == "1":
-            oracle.cx(m, n)
-
-    # Place X-gates again to revert to original inputs on 0 to n-1 qubits
-    for k in range(n):
-        if xGatesString[k] == "1":
-            oracle.x(k)
-
-    return oracle
-
-
-def DeustchJoszaAlgo(n, FunctionOracle):
-    dj_circuit = QuantumCircuit(n + 1, n)
-
-    # Apply H-gates
-    for qubit in range(n):
-        dj_circuit.h(qubit)
-
-    # Put ancillia qubit in state |->
-    dj_circuit.x(n)
-    dj_circuit.h(n)
-
-    dj_circuit.barrier()
-
-    # Add Oracle
-    dj_circuit = dj_circuit.compose(FunctionOracle)
-
-    dj_circuit.barrier()
-
-    # Repeat H-Gates
-    for qubit in range(n):
-        dj_circuit.h(qubit)
-
-    dj_circuit.barrier()
-
-    # Measure
-    for i in range(n):
-        dj_circuit.measure(i, i)
-
-    return dj_circuit
-
-
-def RunCircuit(circuit, provider, backend_name, shots=1024):
-    backend = provider.get_backend(backend_name)
-    job = transpile(circuit, backend=backend, shots=shots)
-    results = job.result()
-    counts = results.get_counts()
-    job_monitor(job)
-    job.status()
-    return counts
-
-
-def run_on_simulator(circuit, provider, backend):
-    answer = RunCircuit(circuit, provider, backend, shots=1024)
-    st.subheader("Result Counts:")
-    st.write(answer)  # Display result counts as text
-    st.subheader("Histogram:")
-    fig, ax = plt.subplots()  # Create a Matplotlib figure and axes
-    plot_histogram(answer, ax=ax)  # Pass the axes to the plot_histogram function
-    st.pyplot(fig)  # Display the Matplotlib figure using st.pyplot
-
-
-def run_on_real_backend(circuit, provider_api_key, backend):
-    IBMProvider.save_account(provider_api_key, overwrite=True)
-    provider = IBMProvider()
-    # backend = 'ibm_perth'
-    answer = RunCircuit(circuit, provider, backend, shots=1024)
-    st.subheader("Result Counts:")
-    st.write(answer)  # Display result counts as text
-    st.subheader("Histogram:")
-    fig, ax = plt.subplots()  # Create a Matplotlib figure and axes
-    plot_histogram(answer, ax=ax)  # Pass the axes to the plot_histogram function
-    st.pyplot(fig)  # Display the Matplotlib figure using st.pyplot
-
-
 # ########## Use the DJ Algorithm ##########
-
 # Page Config
 st.set_page_config(page_title='Deustch Josza Algorithm - Unravel Quantum', page_icon="⚔️", layout='wide')
 
 st.title("Deustch Josza Algorithm")
 
-n = st.slider("Select the number of qubits (n)", 1, 10, 3)
-st.write(f"Selected number of qubits: {n}")
+timer = profiling_sidebar("dj")
 
-f0allx = ConstantFunctionOracle(n, 0)
-f1allx = ConstantFunctionOracle(n, 1)
-f01half = BalancedFunctionOracle(n)
-
-functions = {"Constant Function (f(x) = 0)": f0allx, "Constant Function (f(x) = 1)": f1allx, "Balanced Function": f01half}
-selected_function = st.selectbox("Select the type of function", list(functions.keys()))
+engine = st.selectbox("Select Simulation Engine", list(ENGINE_QUBIT_LIMITS.keys()))
+phase_oracle, synthesis, max_n = oracle_style_form(engine)
+n = st.slider("Select the number of qubits (n)", 1, max_n, 3)
+st.write(f"Selected number of qubits: {n}")
 
-dj_circuit = DeustchJoszaAlgo(n, functions[selected_function])
+# A first visit starts on one of the gallery's precomputed oracles; rerolling draws from the full range
+st.session_state.setdefault("dj_oracle_seed", randrange(GALLERY_SEEDS))
+seed_column, reroll_column = st.columns([3, 1])
+seed = seed_column.number_input("Oracle Seed", min_value=0, max_value=SEED_RANGE - 1, step=1, key="dj_oracle_seed")
+reroll_column.button("Reroll Oracle", on_click=reroll_seed, args=("dj_oracle_seed",))
+
+balancedString = pinned_spec("dj_balanced_string", n, seed, lambda: generate_balanced_bitstring(n, seed))
+
+oracle_specs = {
+    "Constant Function (f(x) = 0)": ("constant", 0),
+    "Constant Function (f(x) = 1)": ("constant", 1),
+    "Balanced Function": ("balanced", balancedString, balancedString),
+}
+selected_function = st.selectbox("Select the type of function", list(oracle_specs.keys()))
+oracle_spec = oracle_specs[selected_function]
+
+# Only the selected oracle is built, and only once per (n, oracle spec)
+oracle_style = oracle_style_key(phase_oracle, synthesis)
+circuit_key = ("dj", n, oracle_spec, *oracle_style)
+dj_circuit = keyed_circuit(circuit_key, timer)
+if phase_oracle:
+    show_oracle_check("dj", n, oracle_spec)
 
 st.write("**Circuit**")
-fig, ax = plt.subplots()
-circuit_drawer(dj_circuit, output='mpl', ax=ax) # Display the circuit using Matplotlib
-st.pyplot(fig) # Show the Matplotlib figure in Streamlit
-
-# providers = {"BasicAer": BasicProvider, "AerSimulator": AerSimulator}
-providers = {"BasicAer": BasicProvider}
-selected_provider = st.selectbox("Select Provider", list(providers.keys()))
-backends = providers[selected_provider]().backends()
-selected_backend = st.selectbox("Select Backend", list(backends))
+show_circuit_diagram(circuit_key, dj_circuit, timer)
 
-if st.button("Run on Simulator") and selected_provider in providers:
-    run_on_simulator(dj_circuit, providers[selected_provider], str(selected_backend))
+settings = run_settings_form(dj_circuit, circuit_key, engine, timer)
 
-# provider_api_key = st.text_input("Enter your IBM Quantum Experience API Key (for real backend)")
+# Every oracle variant for the current n, run together in one backend job
+variants = make_batch("dj", n, oracle_specs.values(), oracle_specs.keys(), oracle_style)
 
-# if st.button("Run on Real Backend") and provider_api_key:
-#     backends = IBMProvider.backends()
-#     selected_backend = st.selectbox("Select Backend", list(backends))
-#     run_on_real_backend(dj_circuit, provider_api_key, selected_backend)
+job_pending = run_section(circuit_key, settings, variants, "Run All Variants on Simulator")
+hardware_pending = hardware_section(circuit_key, settings, variants, "Submit All Variants to Hardware")
 
 
 # ################################### Show the Implementation #########################################
@@ -165,7 +78,6 @@ from qiskit import QuantumCircuit, transpile
 from qiskit.providers.basic_provider import BasicProvider
 from qiskit_aer import AerSimulator
 from qiskit.visualization import plot_histogram, circuit_drawer
-from qiskit_ibm_provider.job import job_monitor
 from qiskit_ibm_provider import IBMProvider
 from random import choice
 
@@ -241,11 +153,8 @@ def RunCircuit(circuit, provider, backend_name, shots=1024):
     backend = provider.get_backend(backend_name)
     transpiled_circuit = transpile(circuit, backend=backend)
     job = backend.run(transpiled_circuit, shots=shots)
-    results = job.result()
-    counts = results.get_counts()
-    job_monitor(job)
-    job.status()
-    return counts
+    # result() waits for the job, on a simulator or a real device
+    return job.result().get_counts()
 
 
 def run_on_simulator(circuit, provider, backend, shots=1024):
@@ -262,6 +171,8 @@ def run_on_real_backend(circuit, provider_api_key, backend, shots=1024):
     return answer
 
 # Create DJ Circuit
+n = 3
+
 f0allx = ConstantFunctionOracle(n, 0)
 f1allx = ConstantFunctionOracle(n, 1)
 f01half = BalancedFunctionOracle(n, "101", "101")
@@ -270,8 +181,8 @@ dj_circuit = DeustchJoszaAlgo(n, f01half)
 dj_circuit.draw('mpl')
 
 # Run on the simulator
-provider = BasicProvider
-backend = 'qasm_simulator'
+provider = BasicProvider()
+backend = 'basic_simulator'
 run_on_simulator(dj_circuit, provider, backend, shots=1024)
 
 # Run on the real backend
@@ -313,4 +224,6 @@ with c4:
 with c5:
     st.info('**Twitter: [@jaisarita](https://github.com/devilkiller-ag)**', icon="🐤")
 with c6:
-    st.info('**Hashnode: [jaisarita](https://jaisarita.hashnode.dev/)**', icon="✍🏻")
\ No newline at end of file
+    st.info('**Hashnode: [jaisarita](https://jaisarita.hashnode.dev/)**', icon="✍🏻")
+
+finish_page("dj", timer, job_pending, hardware_pending)
@@ -1,106 +1,30 @@
 # ########## Import Initialization ############
-from qiskit import QuantumCircuit, transpile
-from qiskit.providers.basic_provider import BasicProvider
-from qiskit_aer import AerSimulator
-from qiskit.visualization import plot_histogram, circuit_drawer
-from qiskit_ibm_provider.job import job_monitor
-from qiskit_ibm_provider import IBMProvider
 import streamlit as st
-import matplotlib.pyplot as plt
-from random import choice
+from random import randrange
+from unravel.algorithms import oracle_style_key
+from unravel.bernstein_vazirani import generate_secret_bitstring
+from unravel.gallery import GALLERY_SEEDS
+from unravel.stabilizer import ENGINE_QUBIT_LIMITS
+from unravel.ui import (
+    SEED_RANGE,
+    finish_page,
+    hardware_section,
+    keyed_circuit,
+    make_batch,
+    oracle_style_form,
+    pinned_spec,
+    profiling_sidebar,
+    reroll_seed,
+    run_section,
+    run_settings_form,
+    show_circuit_diagram,
+    show_oracle_check,
+)
 
 # #############################################
 
 
-# ########## Bernstien Vazirani Algorithm ##########
-def generate_secret_bitstring(n):
-    return "".join(choice("01") for _ in range(n))
-
-
-# Oracle to implement bitstring multiplication with input state
-def BVOracle(n, s=""):
-    oracle = QuantumCircuit(n + 1)
-
-    s = s or generate_secret_bitstring(n)  # the hidden binary string
-    # print(s)
-
-    index = n - 1
-    for q in s:
-        if q == "1":
-            oracle.cx(index, n)
-        index -= 1
-
-    return oracle
-
-
-def BernsteinVaziraniAlgo(n, bv_oracle):
-    # We need a circuit with n qubits, plus one ancilla qubit
-    # Also we need n classical bits to write the output
-    bv_circuit = QuantumCircuit(n + 1, n)
-
-    # Apply Hadamard gates before querying the oracle
-    for i in range(n):
-        bv_circuit.h(i)
-
-    # Put Ancilla Qubit in state |->
-    bv_circuit.x(n)
-    bv_circuit.h(n)
-
-    # Apply barrier
-    bv_circuit.barrier()
-
-    bv_circuit = bv_circuit.compose(bv_oracle)
-
-    # Apply barrier
-    bv_circuit.barrier()
-
-    # Apply Hadamard gates before querying the oracle
-    for i in range(n):
-        bv_circuit.h(i)
-
-    # Apply Measurement
-    for i in range(n):
-        bv_circuit.measure(i, i)
-
-    return bv_circuit
-
-
-def RunCircuit(circuit, provider, backend_name, shots=1024):
-    backend = provider.get_backend(backend_name)
-    transpiled_circuit = transpile(circuit, backend=backend)
-    job = backend.run(transpiled_circuit, shots=shots)
-    results = job.result()
-    counts = results.get_counts()
-    job_monitor(job)
-    job.status()
-    return counts
-
-
-def run_on_simulator(circuit, provider, backend):
-    answer = RunCircuit(circuit, provider, backend, shots=1024)
-    st.subheader("Result Counts:")
-    st.write(answer)  # Display result counts as text
-    st.subheader("Histogram:")
-    fig, ax = plt.subplots()  # Create a Matplotlib figure and axes
-    plot_histogram(answer, ax=ax)  # Pass the axes to the plot_histogram function
-    st.pyplot(fig)  # Display the Matplotlib figure using st.pyplot
-
-
-def run_on_real_backend(circuit, provider_api_key, backend):
-    IBMProvider.save_account(provider_api_key, overwrite=True)
-    provider = IBMProvider()
-    # backend = 'ibm_perth'
-    answer = RunCircuit(circuit, provider, backend, shots=1024)
-    st.subheader("Result Counts:")
-    st.write(answer)  # Display result counts as text
-    st.subheader("Histogram:")
-    fig, ax = plt.subplots()  # Create a Matplotlib figure and axes
-    plot_histogram(answer, ax=ax)  # Pass the axes to the plot_histogram function
-    st.pyplot(fig)  # Display the Matplotlib figure using st.pyplot
-
-
-# ########## Use the DJ Algorithm ##########
-
+# ########## Use the BV Algorithm ##########
 # Page Config
 st.set_page_config(
     page_title="Bernstein Vazirani Algorithm - Unravel Quantum",
@@ -110,16 +34,20 @@ st.set_page_config(
 
 st.title("Bernstein Vazirani Algorithm")
 
+timer = profiling_sidebar("bv")
+
 # n = st.slider("Select the number of qubits (n)", 1, 10, 3)
 s = ""  # secret binary string
 
+engine = st.selectbox("Select Simulation Engine", list(ENGINE_QUBIT_LIMITS.keys()))
+
 header = st.columns([1])
 header[0].write("**Number of qubits**")
 
+phase_oracle, synthesis, max_n = oracle_style_form(engine)
+
 input = st.columns([1])
-n = input[0].slider(
-    "Select the number of qubits (n)", 1, 10, 3, label_visibility="hidden"
-)
+n = input[0].slider("Select the number of qubits (n)", 1, max_n, 3, label_visibility="hidden")
 st.write(f"Selected number of qubits: {n}")
 
 
@@ -140,35 +68,43 @@ if radio_choice == "Enter Your Own Secret Bitstring Here":
         label_visibility="hidden",
         disabled=(radio_choice == "Generate Random Secret Bitstring"),
     )
-
-
-s = s or generate_secret_bitstring(n)
-
-bv_oracle = BVOracle(n, s)
-bv_circuit = BernsteinVaziraniAlgo(n, bv_oracle)
+    # Same check as the batch box; nothing below can be built without a valid secret
+    if len(s) != n or set(s) - set("01"):
+        st.error(f"Enter a secret bitstring of {n} zeros and ones")
+        st.stop()
+else:
+    # A first visit starts on one of the gallery's precomputed oracles; rerolling draws from the full range
+    st.session_state.setdefault("bv_secret_seed", randrange(GALLERY_SEEDS))
+    seed = input2[1].number_input("Secret Seed", min_value=0, max_value=SEED_RANGE - 1, step=1, key="bv_secret_seed")
+    input2[1].button("Reroll Secret", on_click=reroll_seed, args=("bv_secret_seed",))
+    s = pinned_spec("bv_secret_bitstring", n, seed, lambda: generate_secret_bitstring(n, seed))
+
+# The circuit is only built once per (n, secret bitstring)
+oracle_style = oracle_style_key(phase_oracle, synthesis)
+circuit_key = ("bv", n, ("bv", s), *oracle_style)
+bv_circuit = keyed_circuit(circuit_key, timer)
+if phase_oracle:
+    show_oracle_check("bv", n, ("bv", s))
 
 st.write("**Circuit**")
-fig, ax = plt.subplots()
-circuit_drawer(bv_circuit, output='mpl', ax=ax) # Display the circuit using Matplotlib
-st.pyplot(fig) # Show the Matplotlib figure in Streamlit
+show_circuit_diagram(circuit_key, bv_circuit, timer)
 
-# providers = {"BasicAer": BasicProvider, "AerSimulator": AerSimulator}
-providers = {"BasicAer": BasicProvider}
-selected_provider = st.selectbox("Select Provider", list(providers.keys()))
-backends = providers[selected_provider]().backends()
-selected_backend = st.selectbox("Select Backend", list(backends))
+settings = run_settings_form(bv_circuit, circuit_key, engine, timer)
 
-if st.button("Run on Simulator"):
-    st.write("Secret Bitstring: ", s)
-    if selected_provider in providers:
-        run_on_simulator(bv_circuit, providers[selected_provider], str(selected_backend))
-
-# provider_api_key = st.text_input("Enter your IBM Quantum Experience API Key (for real backend)")
+# A batch of secret bitstrings, run together in one backend job
+batch_text = st.text_area(
+    "Batch of Secret Bitstrings (one per line)", placeholder="Enter one secret bitstring per line to run them all at once"
+)
+batch_secrets = [line.strip() for line in batch_text.splitlines() if line.strip()]
+invalid_secrets = [secret for secret in batch_secrets if len(secret) != n or set(secret) - set("01")]
+batch_error = f"Enter one secret bitstring of {n} zeros and ones per line" if not batch_secrets or invalid_secrets else None
+batch = make_batch(
+    "bv", n, [("bv", secret) for secret in batch_secrets], [f"Secret Bitstring: {secret}" for secret in batch_secrets],
+    oracle_style,
+)
 
-# if st.button("Run on Real Backend") and provider_api_key:
-#     backends = IBMProvider.backends()
-#     selected_backend = st.selectbox("Select Backend", list(backends))
-#     run_on_real_backend(bv_circuit, provider_api_key, selected_backend)
+job_pending = run_section(circuit_key, settings, batch, "Run Batch on Simulator", batch_error, f"Secret Bitstring: {s}")
+hardware_pending = hardware_section(circuit_key, settings, batch, "Submit Batch to Hardware", batch_error is not None)
 
 # ################################### Show the Implementation #########################################
 bv_algo_code = """
@@ -177,7 +113,6 @@ from qiskit import QuantumCircuit, transpile
 from qiskit.providers.basic_provider import BasicProvider
 from qiskit_aer import AerSimulator
 from qiskit.visualization import plot_histogram, circuit_drawer
-from qiskit_ibm_provider.job import job_monitor
 from qiskit_ibm_provider import IBMProvider
 from random import choice
 
@@ -234,11 +169,8 @@ def RunCircuit(circuit, provider, backend_name, shots=1024):
     backend = provider.get_backend(backend_name)
     transpiled_circuit = transpile(circuit, backend=backend)
     job = backend.run(transpiled_circuit, shots=shots)
-    results = job.result()
-    counts = results.get_counts()
-    job_monitor(job)
-    job.status()
-    return counts
+    # result() waits for the job, on a simulator or a real device
+    return job.result().get_counts()
 
 
 def run_on_simulator(circuit, provider, backend, shots=1024):
@@ -261,8 +193,8 @@ bv_circuit = BernsteinVaziraniAlgo(n, bv_oracle)
 bv_circuit.draw('mpl')
 
 # Run on the simulator
-provider = BasicProvider
-backend = 'qasm_simulator'
+provider = BasicProvider()
+backend = 'basic_simulator'
 run_on_simulator(bv_circuit, provider, backend, shots=1024)
 
 # Run on the real backend
@@ -305,4 +237,6 @@ with c4:
 with c5:
     st.info('**Twitter: [@jaisarita](https://github.com/devilkiller-ag)**', icon="🐤")
 with c6:
-    st.info('**Hashnode: [jaisarita](https://jaisarita.hashnode.dev/)**', icon="✍🏻")
\ No newline at end of file
+    st.info('**Hashnode: [jaisarita](https://jaisarita.hashnode.dev/)**', icon="✍🏻")
+
+finish_page("bv", timer, job_pending, hardware_pending)
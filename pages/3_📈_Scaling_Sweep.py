@@ -0,0 +1,87 @@
+# ########## Import Initialization ############
+import os
+
+import pandas as pd
+import streamlit as st
+from unravel.algorithms import ALGORITHM_NAMES, ORACLE_KINDS
+from unravel.hardware import FAKE_DEVICES
+from unravel.noise import IDEAL, device_qubits
+from unravel.stabilizer import ENGINE_QUBIT_LIMITS
+from unravel.sweep import run_noisy_sweep, run_sweep, sweep_tasks
+# #############################################
+
+
+ALGORITHMS = {name: algorithm for algorithm, name in ALGORITHM_NAMES.items()}
+
+
+def show_sweep_results(rows):
+    results = pd.DataFrame(rows).sort_values(["algorithm", "oracle", "n", "seed"])
+    summary = results.groupby(["algorithm", "n"])[
+        ["build_s", "transpile_s", "simulate_s", "depth", "size", "success_probability", "mean_hamming"]
+    ].mean()
+
+    st.subheader("Wall Time per Stage (mean over oracles and seeds)")
+    for algorithm in summary.index.get_level_values("algorithm").unique():
+        st.write(f"**{algorithm.upper()}**")
+        st.line_chart(summary.loc[algorithm][["build_s", "transpile_s", "simulate_s"]])
+
+    st.subheader("Success Probability")
+    st.line_chart(summary["success_probability"].unstack("algorithm"))
+
+    st.subheader("Mean Hamming Distance from the Noiseless Outcome")
+    st.line_chart(summary["mean_hamming"].unstack("algorithm"))
+
+    st.subheader("All Runs")
+    st.dataframe(results, use_container_width=True)
+    st.download_button("Download CSV", results.to_csv(index=False), file_name="unravel_sweep.csv", mime="text/csv")
+
+
+# ########## Use the Sweep ##########
+
+# Page Config
+st.set_page_config(page_title='Scaling Sweep - Unravel Quantum', page_icon="📈", layout='wide')
+
+st.title("Scaling Sweep")
+
+st.write("""
+    Run Deustch Josza and Bernstein Vazirani over a range of qubit counts, oracles and random seeds in parallel, and see how the build, transpile and simulation times, circuit size and success probability scale with n.
+""")
+
+# With a noise model every run goes into one Aer job per simulation method instead of one process per run
+noise = st.selectbox("Noise model", [IDEAL, *FAKE_DEVICES])
+engine = st.selectbox("Select Simulation Engine", list(ENGINE_QUBIT_LIMITS.keys()), disabled=noise != IDEAL)
+# The DJ ancilla needs one qubit on top of n, and noisy statevectors stay dense
+max_n = ENGINE_QUBIT_LIMITS[engine] if noise == IDEAL else min(device_qubits(noise) - 1, ENGINE_QUBIT_LIMITS["Statevector"])
+selected_algorithms = st.multiselect("Select Algorithms", list(ALGORITHMS.keys()), default=list(ALGORITHMS.keys()))
+n_min, n_max = st.slider("Range of qubit counts (n)", 1, max_n, (1, min(6, max_n)))
+n_step = st.number_input("Step", min_value=1, value=1)
+all_oracles = sorted({oracle for oracles in ORACLE_KINDS.values() for oracle in oracles})
+selected_oracles = st.multiselect("Select Oracles", all_oracles, default=all_oracles)
+seed_count = st.number_input("Number of random seeds per setting", min_value=1, max_value=100, value=3)
+shots = st.number_input("Shots per run", min_value=1, max_value=100000, value=1024)
+workers = st.number_input(
+    "Worker processes", min_value=1, max_value=os.cpu_count() or 1, value=os.cpu_count() or 1, disabled=noise != IDEAL
+)
+
+tasks = sweep_tasks(
+    [ALGORITHMS[name] for name in selected_algorithms], range(n_min, n_max + 1, n_step), range(seed_count), selected_oracles
+)
+st.write(f"Runs in this sweep: {len(tasks)}")
+
+run_clicked = st.button("Run Sweep") and bool(tasks)
+if run_clicked and noise != IDEAL:
+    with st.spinner(f"Simulating {len(tasks)} runs with the {noise} noise model..."):
+        st.session_state.sweep_rows = run_noisy_sweep(tasks, noise, shots=shots)
+elif run_clicked:
+    rows = []
+    progress = st.progress(0.0, text="Starting worker processes...")
+    table = st.empty()
+    for row in run_sweep(tasks, shots=shots, engine=engine, max_workers=workers):
+        rows.append(row)
+        progress.progress(len(rows) / len(tasks), text=f"Finished {len(rows)} of {len(tasks)} runs")
+        table.dataframe(pd.DataFrame(rows), use_container_width=True)
+    table.empty()
+    st.session_state.sweep_rows = rows
+
+if st.session_state.get("sweep_rows"):
+    show_sweep_results(st.session_state.sweep_rows)
@@ -0,0 +1,11 @@
+# ########## Test Configuration ##########
+import os
+import tempfile
+
+
+# Set before unravel is imported: every test session gets its own result store and no gallery,
+# so runs never read from or write to ~/.cache/unravel
+_scratch = tempfile.mkdtemp(prefix="unravel-tests-")
+os.environ["UNRAVEL_RESULT_STORE"] = os.path.join(_scratch, "results.sqlite")
+os.environ["UNRAVEL_GALLERY"] = os.path.join(_scratch, "gallery.zip")
+os.environ["UNRAVEL_WARMUP"] = "0"
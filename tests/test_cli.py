@@ -0,0 +1,24 @@
+# ########## Command Line Tests ##########
+import json
+
+import pytest
+
+from unravel.cli import main
+
+
+@pytest.mark.parametrize("argument", ["--n=0", "--n=-2", "--shots=0", "--provider=Unknown"])
+def test_run_rejects_bad_arguments(argument):
+    with pytest.raises(SystemExit) as exit_info:
+        main(["run", "dj", argument])
+    assert exit_info.value.code == 2
+
+
+def test_backend_must_belong_to_the_provider():
+    with pytest.raises(SystemExit, match="BasicAer provider"):
+        main(["run", "dj", "--backend", "aer_simulator"])
+
+
+def test_run_on_the_aer_provider(capsys):
+    main(["run", "bv", "--n", "4", "--secret", "1011", "--provider", "Aer", "--backend", "aer_simulator", "--json"])
+    result = json.loads(capsys.readouterr().out)
+    assert result["counts"] == {"1011": 1024}
@@ -0,0 +1,51 @@
+# ########## Packed Outcome Tests ##########
+import numpy as np
+import pytest
+
+from unravel.counts import MEMORY_MAX_BITS, counts_to_arrays, memory_to_array, outcome_dtype, pack_bits, top_counts
+
+
+@pytest.mark.parametrize("width", [1, 7, 8, 9, 16, 17, 33, 64])
+def test_pack_bits_and_memory_to_array_round_trip(width):
+    rng = np.random.default_rng(width)
+    bits = rng.integers(0, 2, size=(200, width), dtype=np.uint8)
+    packed = pack_bits(bits)
+    assert packed.dtype == outcome_dtype(width)
+    # Bitstrings as Aer writes them: the leftmost character is the highest clbit
+    memory = ["".join(str(bit) for bit in row[::-1]) for row in bits]
+    assert [format(int(value), f"0{width}b") for value in packed] == memory
+    np.testing.assert_array_equal(memory_to_array(memory), packed)
+
+
+def test_memory_to_array_drops_register_separators():
+    np.testing.assert_array_equal(memory_to_array(["01 101", "10 000"]), memory_to_array(["01101", "10000"]))
+
+
+def test_memory_to_array_of_no_shots():
+    assert len(memory_to_array([])) == 0
+
+
+def test_outcome_dtype_limits():
+    assert outcome_dtype(8) == np.uint8
+    assert outcome_dtype(9) == np.uint16
+    assert outcome_dtype(MEMORY_MAX_BITS) == np.uint64
+    with pytest.raises(ValueError):
+        outcome_dtype(MEMORY_MAX_BITS + 1)
+
+
+def test_counts_to_arrays():
+    outcomes, frequencies = counts_to_arrays({"011": 5, "100": 2})
+    assert outcomes.tolist() == [0b011, 0b100]
+    assert frequencies.tolist() == [5, 2]
+
+
+def test_top_counts_sums_the_rest():
+    counts = {format(value, "04b"): value + 1 for value in range(16)}
+    top = top_counts(counts, 4)
+    assert list(top) == ["1100", "1101", "1110", "1111", "other"]
+    assert sum(top.values()) == sum(counts.values())
+
+
+def test_top_counts_keeps_small_counts_whole():
+    counts = {"00": 3, "11": 5}
+    assert top_counts(counts, 4) == counts
@@ -0,0 +1,50 @@
+# ########## Hardware Session Tests ##########
+import time
+from threading import Event, Thread
+
+import unravel.hardware
+from unravel.cache import LRUCache
+from unravel.hardware import FAKE_PROVIDER_NAME, get_hardware_jobs, get_hardware_session
+from unravel.jobs import DONE
+from unravel.ui import keyed_circuit, run_on_real_backend
+
+
+def test_a_slow_login_does_not_hold_up_other_keys(monkeypatch):
+    started, release = Event(), Event()
+
+    def login(provider_name, api_key=None):
+        if api_key == "slow":
+            started.set()
+            release.wait(10)
+        return object()
+
+    monkeypatch.setattr(unravel.hardware, "HARDWARE_SESSIONS", LRUCache(maxsize=32))
+    monkeypatch.setattr(unravel.hardware, "HardwareSession", login)
+    slow = Thread(target=get_hardware_session, args=(FAKE_PROVIDER_NAME, "slow"))
+    slow.start()
+    assert started.wait(10)
+    # Another key logs in while the slow login is still in progress
+    fast = []
+    Thread(target=lambda: fast.append(get_hardware_session(FAKE_PROVIDER_NAME, "fast"))).start()
+    for _ in range(100):
+        if fast:
+            break
+        time.sleep(0.05)
+    release.set()
+    slow.join()
+    assert fast
+    assert get_hardware_session(FAKE_PROVIDER_NAME, "fast") is fast[0]
+
+
+def test_fake_device_job_is_polled_to_completion():
+    key = ("bv", 3, ("bv", "101"))
+    session = get_hardware_session(FAKE_PROVIDER_NAME)
+    job_id = run_on_real_backend([keyed_circuit(key)], session, "fake_5q_v1", 512, [key])
+    jobs = get_hardware_jobs()
+    for _ in range(600):
+        if jobs.status(job_id) == DONE:
+            break
+        time.sleep(0.05)
+    counts = jobs.result(job_id)[0]
+    assert sum(counts.values()) == 512
+    assert max(counts, key=counts.get) == "101"
@@ -0,0 +1,119 @@
+# ########## Oracle Bitmask Tests ##########
+from math import pi
+
+import pytest
+from qiskit import QuantumCircuit
+
+from unravel.algorithms import ORACLE_KINDS, build_circuit, oracle_spec
+from unravel.oracles import OracleMask, expected_outcome, oracle_mask
+from unravel.parity import append_parity
+from unravel.templates import mask_oracle
+from unravel.verify import VERIFY_VARIANTS, mask_spec
+
+
+# The oracle builders as they were before bitmask specs: one gate per "1" character of the spec's bitstrings
+def reference_oracle(n, spec, phase_oracle=False, synthesis="chain"):
+    oracle = QuantumCircuit(n if phase_oracle else n + 1)
+    if spec[0] == "constant":
+        if spec[1] == 1:
+            if phase_oracle:
+                oracle.global_phase = pi
+            else:
+                oracle.x(n)
+        return oracle
+    if spec[0] == "bv":
+        # s is read most significant bit first, so s[0] controls qubit n - 1
+        flipped = []
+        parity = [n - 1 - i for i, bit in enumerate(spec[1]) if bit == "1"]
+    else:
+        flipped = [i for i in range(n) if spec[1][i] == "1"]
+        parity = [m for m in range(n) if spec[2][m] == "1"]
+    for qubit in flipped:
+        oracle.x(qubit)
+    if phase_oracle:
+        for qubit in parity:
+            oracle.z(qubit)
+    else:
+        append_parity(oracle, parity, n, synthesis)
+    for qubit in flipped:
+        oracle.x(qubit)
+    return oracle
+
+
+def reference_circuit(algorithm, n, spec, phase_oracle=False, synthesis="chain"):
+    oracle = reference_oracle(n, spec, phase_oracle, synthesis)
+    circuit = QuantumCircuit(oracle.num_qubits, n)
+    for qubit in range(n):
+        circuit.h(qubit)
+    if not phase_oracle:
+        circuit.x(n)
+        circuit.h(n)
+    circuit.barrier()
+    circuit = circuit.compose(oracle)
+    circuit.barrier()
+    for qubit in range(n):
+        circuit.h(qubit)
+    # Only DJ had a barrier before measuring
+    if algorithm == "dj":
+        circuit.barrier()
+    for qubit in range(n):
+        circuit.measure(qubit, qubit)
+    return circuit
+
+
+CASES = [
+    (algorithm, n, oracle_spec(algorithm, kind, n, seed))
+    for algorithm, kinds in ORACLE_KINDS.items()
+    for n in [1, 2, 3, 5, 8]
+    for kind in kinds
+    for seed in range(3)
+]
+
+
+@pytest.mark.parametrize("phase_oracle, synthesis", VERIFY_VARIANTS)
+@pytest.mark.parametrize("algorithm, n, spec", CASES)
+def test_mask_oracle_matches_string_builders(algorithm, n, spec, phase_oracle, synthesis):
+    expected = reference_oracle(n, spec, phase_oracle, synthesis)
+    assert mask_oracle(n, oracle_mask(n, spec), phase_oracle, synthesis) == expected
+    assert mask_oracle(n, oracle_mask(n, mask_spec(n, spec)), phase_oracle, synthesis) == expected
+    assert build_circuit(algorithm, n, spec, phase_oracle=phase_oracle, synthesis=synthesis) == reference_circuit(
+        algorithm, n, spec, phase_oracle, synthesis
+    )
+
+
+def test_oracle_mask_bit_order():
+    # Balanced gate strings list qubit 0 first; a BV secret is a binary number
+    assert oracle_mask(4, ("balanced", "1100", "0101")) == OracleMask("balanced", x_mask=0b0011, parity_mask=0b1010)
+    assert oracle_mask(4, ("bv", "0011")) == OracleMask("bv", parity_mask=0b0011)
+    assert oracle_mask(4, ("balanced", 0b0011, 0b1010)) == oracle_mask(4, ("balanced", "1100", "0101"))
+    assert oracle_mask(3, ("constant", 1)) == OracleMask("constant", output=1)
+
+
+def test_expected_outcome_is_the_measured_bitstring():
+    # Read as a bitstring with qubit 0 rightmost, the expected outcome is the CX string reversed, or s itself
+    assert format(expected_outcome(oracle_mask(4, ("balanced", "0110", "1101"))), "04b") == "1011"
+    assert format(expected_outcome(oracle_mask(4, ("bv", "0110"))), "04b") == "0110"
+    assert expected_outcome(oracle_mask(4, ("constant", 1))) == 0
+
+
+@pytest.mark.parametrize(
+    "spec",
+    [
+        ("bv", "abc"),
+        ("bv", "10"),
+        ("bv", "1011"),
+        ("bv", "1 1"),
+        ("balanced", "101", "10"),
+        ("balanced", "1010", "101"),
+        ("balanced", "102", "101"),
+        ("bv", 0b1000),
+        ("balanced", 0b1000, 1),
+        ("balanced", "101", "000"),
+        ("balanced", 0b101, 0),
+        ("constant", 2),
+        ("unknown", "101"),
+    ],
+)
+def test_oracle_mask_rejects_bad_specs(spec):
+    with pytest.raises(ValueError):
+        oracle_mask(3, spec)
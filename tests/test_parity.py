@@ -0,0 +1,42 @@
+# ########## Parity Network Tests ##########
+import math
+from random import Random
+
+import pytest
+from qiskit import QuantumCircuit
+from qiskit.quantum_info import Operator
+
+from unravel.parity import append_parity, parity_tree_layers
+
+
+@pytest.mark.parametrize("k", range(1, 18))
+def test_parity_tree_layers_fold_to_the_parity(k):
+    qubits = list(range(10, 10 + k))
+    layers, root = parity_tree_layers(qubits)
+    assert len(layers) == math.ceil(math.log2(k))
+    assert sum(len(layer) for layer in layers) == k - 1
+    for layer in layers:
+        touched = [qubit for pair in layer for qubit in pair]
+        assert len(touched) == len(set(touched))  # one CX per qubit per layer
+    rng = Random(k)
+    for _ in range(20):
+        inputs = {qubit: rng.randint(0, 1) for qubit in qubits}
+        values = dict(inputs)
+        for layer in layers:
+            for control, target in layer:
+                values[target] ^= values[control]
+        assert values[root] == sum(inputs.values()) % 2
+
+
+@pytest.mark.parametrize("qubits", [[], [0], [0, 2], [0, 1, 2], [3, 0, 2, 1], [0, 1, 2, 3, 4]])
+def test_tree_and_chain_compute_the_same_parity(qubits):
+    n = 5
+    chain = append_parity(QuantumCircuit(n + 1), qubits, n, "chain")
+    tree = append_parity(QuantumCircuit(n + 1), qubits, n, "tree")
+    assert Operator(tree).equiv(Operator(chain))
+    assert tree.count_ops().get("cx", 0) == (2 * (len(qubits) - 1) + 1 if len(qubits) >= 3 else len(qubits))
+
+
+def test_unknown_synthesis_is_rejected():
+    with pytest.raises(ValueError):
+        append_parity(QuantumCircuit(4), [0, 1, 2], 3, "ladder")
@@ -0,0 +1,93 @@
+# ########## Simulation Planner Tests ##########
+import pytest
+from qiskit import QuantumCircuit
+
+from unravel.planner import (
+    DENSITY_MATRIX,
+    MPS,
+    STABILIZER,
+    STATEVECTOR,
+    MemoryBudgetError,
+    active_qubits,
+    estimate,
+    plan_simulation,
+)
+
+
+def ghz(num_qubits, t_gate=False):
+    circuit = QuantumCircuit(num_qubits, num_qubits)
+    circuit.h(0)
+    if t_gate:
+        circuit.t(0)
+    for qubit in range(num_qubits - 1):
+        circuit.cx(qubit, qubit + 1)
+    circuit.measure(range(num_qubits), range(num_qubits))
+    return circuit
+
+
+def entangled(num_qubits):
+    # Enough CX layers that every cut reaches its largest Schmidt rank, so MPS has no advantage
+    circuit = QuantumCircuit(num_qubits, num_qubits)
+    circuit.h(range(num_qubits))
+    circuit.t(range(num_qubits))
+    for _ in range(num_qubits):
+        for qubit in range(num_qubits - 1):
+            circuit.cx(qubit, qubit + 1)
+    circuit.measure(range(num_qubits), range(num_qubits))
+    return circuit
+
+
+def test_clifford_circuits_use_the_stabilizer_tableau():
+    plan = plan_simulation(ghz(100))
+    assert plan.method == STABILIZER
+    assert not plan.downgraded
+
+
+def test_small_circuits_use_the_statevector():
+    plan = plan_simulation(ghz(10, t_gate=True))
+    assert plan.method == STATEVECTOR
+    assert not plan.downgraded
+
+
+def test_large_low_entanglement_circuits_fall_back_to_mps():
+    plan = plan_simulation(ghz(60, t_gate=True))
+    assert plan.method == MPS
+    assert plan.downgraded
+
+
+def test_methods_are_held_to_aer_widths():
+    # A product state is cheapest as an MPS, but AerSimulator's MPS target stops at 63 qubits
+    product = QuantumCircuit(64, 64)
+    product.h(range(64))
+    product.measure(range(64), range(64))
+    assert plan_simulation(product).method == STABILIZER
+    with pytest.raises(MemoryBudgetError):
+        plan_simulation(ghz(64, t_gate=True))
+
+
+def test_a_batch_is_planned_for_its_largest_circuit():
+    assert plan_simulation([ghz(4), ghz(10, t_gate=True)]).method == STATEVECTOR
+
+
+def test_nothing_fits_raises():
+    with pytest.raises(MemoryBudgetError):
+        plan_simulation(ghz(10, t_gate=True), budget_bytes=1)
+
+
+def test_noisy_plans_trade_density_matrix_against_trajectories():
+    # The density matrix costs 4^q once, trajectories cost 2^q per shot
+    assert plan_simulation(ghz(3), shots=1024, noisy=True).method == DENSITY_MATRIX
+    assert plan_simulation(entangled(12), shots=64, noisy=True).method == STATEVECTOR
+
+
+def test_idle_qubits_are_free():
+    # A circuit routed onto a large device only pays for the qubits it uses
+    routed = QuantumCircuit(127, 3)
+    routed.h(5)
+    routed.cx(5, 40)
+    routed.cx(40, 90)
+    routed.barrier()
+    routed.measure([5, 40, 90], range(3))
+    assert active_qubits(routed) == 3
+    assert estimate(STATEVECTOR, routed)[0] == estimate(STATEVECTOR, ghz(3))[0]
+    assert plan_simulation(routed, noisy=True).method == DENSITY_MATRIX
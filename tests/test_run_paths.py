@@ -0,0 +1,145 @@
+# ########## Page Run Path Tests ##########
+import numpy as np
+import pytest
+
+import unravel.execution
+import unravel.gallery
+from unravel.analytic import ANALYTIC_BACKEND_NAME, analytic_distribution
+from unravel.execution import RunCircuit, RunCircuits, RunShots, get_provider
+from unravel.gallery import GALLERY_BACKEND, GALLERY_SHOTS, build_gallery
+from unravel.jobs import get_job_pool
+from unravel.shots import ShotRecord
+from unravel.store import get_result_store
+from unravel.transpiling import DEFAULT_TRANSPILE_OPTIONS
+from unravel.ui import ANALYTIC_PROVIDER, RunSettings, batch_plan_error, gallery_counts, keyed_circuit, make_batch, submit_batch, submit_run
+from unravel.verify import verify_cases, verify_run_paths
+
+
+# DJ and BV are deterministic without noise, so every run path must put all shots on the analytic outcome
+SPECS = [("dj", 3, ("constant", 1)), ("dj", 3, ("balanced", "101", "011")), ("bv", 4, ("bv", "1101"))]
+SETTINGS = {
+    "analytic": RunSettings(ANALYTIC_PROVIDER, ANALYTIC_BACKEND_NAME),
+    "analytic shots": RunSettings(ANALYTIC_PROVIDER, ANALYTIC_BACKEND_NAME, record_shots=True),
+    "basic": RunSettings("BasicAer", "basic_simulator", transpile_options=DEFAULT_TRANSPILE_OPTIONS),
+    "aer": RunSettings("Aer", "aer_simulator", aer_options={"precision": "single"}),
+    "stabilizer": RunSettings("Aer", "aer_simulator", engine="Stabilizer"),
+    "auto": RunSettings("Aer", "aer_simulator", engine="Auto"),
+    "stored": RunSettings("BasicAer", "basic_simulator", use_store=True),
+    "shots": RunSettings("Aer", "aer_simulator", record_shots=True),
+    "streaming": RunSettings("BasicAer", "basic_simulator", streaming=True, chunks=4),
+}
+
+
+def expected_counts(n, spec, shots):
+    (outcome,) = analytic_distribution(n, spec)
+    return {outcome: shots}
+
+
+def wait(job_id):
+    return get_job_pool().result(job_id)
+
+
+@pytest.mark.parametrize("name", SETTINGS)
+@pytest.mark.parametrize("algorithm, n, spec", SPECS)
+def test_submit_run(algorithm, n, spec, name):
+    settings = SETTINGS[name]
+    job_id, stream = submit_run((algorithm, n, spec), settings)
+    result = wait(job_id)
+    if settings.record_shots:
+        assert isinstance(result, ShotRecord)
+        assert result.stats.success_rate() == 1.0
+        assert len(result.memory) == settings.shots
+        result = result.counts()
+    if settings.streaming:
+        # Early stopping may end the run after a few chunks
+        assert result == stream.snapshot() == expected_counts(n, spec, stream.shots_done)
+        assert stream.stopped_early
+    else:
+        assert result == expected_counts(n, spec, settings.shots)
+
+
+@pytest.mark.parametrize("name", ["analytic", "basic", "stabilizer", "stored"])
+def test_submit_batch(name):
+    specs = [("constant", 0), ("constant", 1), ("balanced", "110", "110")]
+    batch = make_batch("dj", 3, specs, [str(spec) for spec in specs], ("tree",))
+    answers = wait(submit_batch(3, batch, SETTINGS[name]))
+    assert answers == [expected_counts(3, spec, 1024) for spec in specs]
+
+
+@pytest.mark.parametrize("key", [("dj", 64, ("constant", 0)), ("bv", 100, ("bv", "10" * 50))])
+def test_auto_runs_circuits_wider_than_aer_mps(key):
+    # AerSimulator's MPS target stops at 63 qubits, so wider Clifford circuits must be planned onto the tableau
+    algorithm, n, spec = key
+    job_id, _ = submit_run(key, SETTINGS["auto"])
+    assert wait(job_id) == expected_counts(n, spec, 1024)
+
+
+def test_batch_plan_error():
+    # Routed onto fake_127q_pulse_v1 this balanced oracle spreads too far for MPS, while the constant ones fit
+    balanced = ("balanced", "110111111001001010011011101110", "110111111001001010011011101110")
+    batch = make_batch("dj", 30, [("constant", 0), balanced], ["constant", "balanced"], ())
+    noisy = RunSettings("Aer", "aer_simulator", noise="fake_127q_pulse_v1")
+    assert batch_plan_error(make_batch("dj", 30, [("constant", 0)], ["constant"], ()), noisy) is None
+    assert "budget" in batch_plan_error(batch, noisy)
+    assert batch_plan_error(batch, SETTINGS["auto"]) is None
+    assert batch_plan_error(batch, SETTINGS["aer"]) is None
+
+
+def test_submit_run_with_noise():
+    settings = RunSettings("Aer", "aer_simulator", noise="fake_5q_v1", shots=2048)
+    job_id, _ = submit_run(("bv", 3, ("bv", "110")), settings)
+    counts = wait(job_id)
+    assert sum(counts.values()) == 2048
+    assert max(counts, key=counts.get) == "110"
+
+
+def test_stored_results_are_reused_only_when_asked():
+    circuit = keyed_circuit(("bv", 5, ("bv", "10110")))
+    provider = get_provider("BasicAer")
+    rows = get_result_store().stats()["rows"]
+    RunCircuit(circuit, provider, "basic_simulator", 512)
+    assert get_result_store().stats()["rows"] == rows
+    first = RunCircuits([circuit], provider, "basic_simulator", 512, use_store=True)
+    assert get_result_store().stats()["rows"] == rows + 1
+    assert RunCircuits([circuit], provider, "basic_simulator", 512, use_store=True) == first
+
+
+def test_run_circuit_memory():
+    circuit = keyed_circuit(("dj", 4, ("balanced", "0110", "1011")))
+    memory = RunCircuit(circuit, get_provider("Aer"), "aer_simulator", 300, memory=True)
+    assert memory.dtype == np.uint8
+    assert memory.tolist() == [0b1101] * 300
+
+
+def test_run_shots_in_chunks(monkeypatch):
+    monkeypatch.setattr(unravel.execution, "MEMORY_CHUNK_SHOTS", 100)
+    circuit = keyed_circuit(("bv", 4, ("bv", "0111")))
+    record = RunShots(circuit, get_provider("Aer"), "aer_simulator", "bv", 4, ("bv", "0111"), shots=250)
+    assert record.counts() == {"0111": 250}
+    assert len(record.memory) == 250
+    # Above keep_shots only the statistics are kept
+    record = RunShots(circuit, get_provider("Aer"), "aer_simulator", "bv", 4, ("bv", "0111"), shots=250, keep_shots=100)
+    assert record.memory is None
+    assert record.stats.shots == 250
+    assert record.stats.hamming.tolist() == [250, 0, 0, 0, 0]
+
+
+def test_gallery_counts_stand_in_for_matching_runs(tmp_path, monkeypatch):
+    key = ("dj", 2, ("balanced", "11", "11"))
+    path = str(tmp_path / "gallery.zip")
+    assert build_gallery(path, [key], max_workers=1) == 1
+    monkeypatch.setattr(unravel.gallery, "GALLERY_PATH", path)
+    counts = expected_counts(2, key[2], GALLERY_SHOTS)
+    assert gallery_counts([key], GALLERY_BACKEND, GALLERY_SHOTS, "Statevector", DEFAULT_TRANSPILE_OPTIONS, None) == [counts]
+    # Anything the gallery was not built with is simulated live
+    assert gallery_counts([key], GALLERY_BACKEND, 2048, "Statevector", None, None) is None
+    assert gallery_counts([key], GALLERY_BACKEND, GALLERY_SHOTS, "Stabilizer", None, None) is None
+    assert gallery_counts([key], GALLERY_BACKEND, GALLERY_SHOTS, "Statevector", None, "fake_5q_v1") is None
+    assert gallery_counts([key], GALLERY_BACKEND, GALLERY_SHOTS, "Statevector", {"optimization_level": 3}, None) is None
+    assert gallery_counts([(*key, "tree")], GALLERY_BACKEND, GALLERY_SHOTS, "Statevector", None, None) is None
+    job_id, _ = submit_run(key, RunSettings("BasicAer", GALLERY_BACKEND))
+    assert wait(job_id) == counts
+
+
+def test_verify_finds_no_failures():
+    assert verify_run_paths(verify_cases(["dj", "bv"], range(1, 4), range(2)), shots=64) == []
@@ -0,0 +1,68 @@
+# ########## Stabilizer Engine Tests ##########
+from collections import Counter
+
+import pytest
+from qiskit import QuantumCircuit
+from qiskit.quantum_info import Statevector, random_clifford
+
+from unravel.counts import memory_to_array
+from unravel.stabilizer import run_stabilizer
+
+
+SHOTS = 4096
+
+
+def measured_clifford(num_qubits, measured, seed):
+    # A random Clifford with only some qubits measured, qubit measured[c] into clbit c
+    unitary = random_clifford(num_qubits, seed=seed).to_circuit()
+    circuit = QuantumCircuit(num_qubits, len(measured))
+    circuit.compose(unitary, inplace=True)
+    circuit.measure(measured, range(len(measured)))
+    return unitary, circuit
+
+
+@pytest.mark.parametrize(
+    "num_qubits, measured, seed",
+    [(3, [0, 1, 2], 1), (4, [2, 0], 2), (5, [4, 1, 3], 3), (6, [5], 4), (6, [0, 2, 4, 1], 5)],
+)
+def test_run_stabilizer_matches_statevector_probabilities(num_qubits, measured, seed):
+    unitary, circuit = measured_clifford(num_qubits, measured, seed)
+    # probabilities_dict puts qargs[0] rightmost, like clbit 0 in a counts key
+    probabilities = Statevector(unitary).probabilities_dict(qargs=measured)
+    support = {outcome for outcome, probability in probabilities.items() if probability > 1e-9}
+    counts = run_stabilizer(circuit, shots=SHOTS, seed=seed)
+    assert set(counts) == support
+    assert sum(counts.values()) == SHOTS
+    for outcome, count in counts.items():
+        assert count / SHOTS == pytest.approx(probabilities[outcome], abs=0.05)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_run_stabilizer_memory_matches_counts(seed):
+    _, circuit = measured_clifford(5, [3, 0, 4], seed)
+    counts = run_stabilizer(circuit, shots=SHOTS, seed=seed)
+    memory = run_stabilizer(circuit, shots=SHOTS, seed=seed, memory=True)
+    assert len(memory) == SHOTS
+    assert Counter(memory.tolist()) == Counter(dict(zip(memory_to_array(list(counts)).tolist(), counts.values())))
+
+
+def test_run_stabilizer_deterministic_and_mid_circuit_outcomes():
+    circuit = QuantumCircuit(2, 2)
+    circuit.x(1)
+    circuit.measure([0, 1], [0, 1])
+    assert run_stabilizer(circuit, shots=100) == {"10": 100}
+    assert run_stabilizer(circuit, shots=100, memory=True).tolist() == [0b10] * 100
+    # A gate after a measurement leaves the affine sampler to Aer
+    circuit = QuantumCircuit(1, 2)
+    circuit.measure(0, 0)
+    circuit.x(0)
+    circuit.measure(0, 1)
+    assert run_stabilizer(circuit, shots=100, seed=1) == {"10": 100}
+
+
+def test_run_stabilizer_rejects_non_clifford_circuits():
+    circuit = QuantumCircuit(1, 1)
+    circuit.t(0)
+    circuit.measure(0, 0)
+    with pytest.raises(ValueError):
+        run_stabilizer(circuit)
@@ -0,0 +1,60 @@
+# ########## Result Store Tests ##########
+import itertools
+from types import SimpleNamespace
+
+from qiskit import QuantumCircuit
+
+import unravel.store
+from unravel.cache import circuit_hash
+from unravel.store import ResultStore, run_fingerprint
+
+
+def fake_clock(monkeypatch):
+    # A clock that ticks once per call, so last_used orders rows even within one millisecond
+    ticks = itertools.count(1)
+    monkeypatch.setattr(unravel.store, "time", SimpleNamespace(time=lambda: float(next(ticks))))
+
+
+def test_round_trip_and_rows(tmp_path):
+    store = ResultStore(str(tmp_path / "results.sqlite"))
+    assert store.get("missing") is None
+    store.put("a" * 64, "aer_simulator", 1024, {"precision": "single"}, {"01": 1024}, {"depth": 3}, 0.5)
+    assert store.get("a" * 64) == {"01": 1024}
+    (row,) = store.rows()
+    assert row["options"] == {"precision": "single"}
+    assert row["metadata"] == {"depth": 3}
+    store.clear()
+    assert store.stats()["rows"] == 0
+
+
+def test_least_recently_used_rows_are_evicted(tmp_path, monkeypatch):
+    fake_clock(monkeypatch)
+    store = ResultStore(str(tmp_path / "results.sqlite"))
+    fingerprints = [letter * 64 for letter in "abcd"]
+    store.put(fingerprints[0], "basic_simulator", 1024, None, {"000": 1024})
+    size = store.stats()["bytes"]
+    store.max_bytes = 3 * size
+    store.put(fingerprints[1], "basic_simulator", 1024, None, {"000": 1024})
+    store.put(fingerprints[2], "basic_simulator", 1024, None, {"000": 1024})
+    assert store.get(fingerprints[0]) is not None  # now the most recently used
+    # Over budget: rows go oldest-used first until 90% of the budget is left
+    store.put(fingerprints[3], "basic_simulator", 1024, None, {"000": 1024})
+    assert store.stats()["rows"] == 2
+    assert store.get(fingerprints[1]) is None
+    assert store.get(fingerprints[2]) is None
+    assert store.get(fingerprints[0]) is not None
+    assert store.get(fingerprints[3]) is not None
+
+
+def test_fingerprint_covers_everything_that_runs():
+    circuit = QuantumCircuit(1, 1)
+    circuit.h(0)
+    circuit.measure(0, 0)
+    fingerprint = run_fingerprint(circuit, "aer_simulator", 1024)
+    assert run_fingerprint(circuit.copy(), "aer_simulator", 1024) == fingerprint
+    assert run_fingerprint(circuit, "aer_simulator", 2048) != fingerprint
+    assert run_fingerprint(circuit, "basic_simulator", 1024) != fingerprint
+    assert run_fingerprint(circuit, "aer_simulator", 1024, {"precision": "single"}) != fingerprint
+    shifted = circuit.copy()
+    shifted.global_phase = 1.0
+    assert circuit_hash(shifted) != circuit_hash(circuit)
@@ -0,0 +1,3 @@
+from unravel.cli import main
+
+main()
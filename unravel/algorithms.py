@@ -0,0 +1,94 @@
+# ########## Algorithm Registry ##########
+from functools import lru_cache
+
+import numpy as np
+from qiskit.quantum_info import Operator
+
+from unravel.analytic import analytic_distribution
+from unravel.bernstein_vazirani import BernsteinVaziraniAlgo, generate_secret_bitstring
+from unravel.deutsch_jozsa import DeustchJoszaAlgo, generate_balanced_bitstring
+from unravel.oracles import oracle_mask
+from unravel.profiling import timed_stage
+from unravel.templates import mask_oracle
+
+
+ALGORITHM_NAMES = {"dj": "Deustch Josza", "bv": "Bernstein Vazirani"}
+
+# Oracle kinds each algorithm can be built with from just (n, seed)
+ORACLE_KINDS = {"dj": ["constant0", "constant1", "balanced"], "bv": ["random"]}
+
+
+def oracle_spec(algorithm, oracle, n, seed=None):
+    if algorithm == "dj" and oracle in ("constant0", "constant1"):
+        return ("constant", int(oracle[-1]))
+    if algorithm == "dj" and oracle == "balanced":
+        bitstring = generate_balanced_bitstring(n, seed)
+        return ("balanced", bitstring, bitstring)
+    if algorithm == "bv" and oracle == "random":
+        return ("bv", generate_secret_bitstring(n, seed))
+    raise ValueError(f"Unknown oracle {oracle!r} for algorithm {algorithm!r}")
+
+
+def boxed_oracle(oracle):
+    # One labelled box instead of the oracle's gates, for drawing large circuits
+    oracle.name = "oracle"
+    return oracle.to_gate(label="Oracle")
+
+
+# Largest n the phase oracle is checked for; the check builds a dense 2^(n+1) x 2^(n+1) operator
+EQUIVALENCE_QUBIT_LIMIT = 8
+
+
+def oracle_style_key(phase_oracle=False, synthesis="chain"):
+    # Circuit cache key suffix; phase oracles have no CX parity to synthesise
+    if phase_oracle:
+        return ("phase",)
+    return ("tree",) if synthesis == "tree" else ()
+
+
+def build_oracle(algorithm, n, spec, phase_oracle=False, synthesis="chain"):
+    # Both algorithms build their oracle from the same bitmask form of the spec
+    if algorithm not in ALGORITHM_NAMES:
+        raise ValueError(f"Unknown algorithm {algorithm!r}")
+    return mask_oracle(n, oracle_mask(n, spec), phase_oracle, synthesis)
+
+
+def build_circuit(algorithm, n, spec, timer=None, collapse_oracle=False, phase_oracle=False, synthesis="chain"):
+    # phase_oracle drops the |-> ancilla, halving the statevector for the same n;
+    # synthesis="tree" builds the ancilla oracle's parity as a log-depth CX tree
+    with timed_stage(timer, "oracle"):
+        oracle = build_oracle(algorithm, n, spec, phase_oracle, synthesis)
+    with timed_stage(timer, "compose"):
+        oracle = boxed_oracle(oracle) if collapse_oracle else oracle
+        if algorithm == "dj":
+            return DeustchJoszaAlgo(n, oracle)
+        return BernsteinVaziraniAlgo(n, oracle)
+
+
+@lru_cache(maxsize=256)
+def phase_oracle_equivalent(algorithm, n, spec):
+    # True when, for every input x, the phase oracle applies (-1)^f(x) up to one global phase,
+    # where f(x) is the bit the ancilla oracle writes into its ancilla
+    ancilla = Operator(build_oracle(algorithm, n, spec)).data
+    phase = Operator(build_oracle(algorithm, n, spec, phase_oracle=True)).data
+    diagonal = np.diag(phase)
+    if not np.allclose(phase, np.diag(diagonal)):
+        return False
+    inputs = np.arange(2**n)
+    # The ancilla is the top qubit, so |x>|1> is basis state x + 2^n
+    flips = np.abs(ancilla[inputs + 2**n, inputs]) > 0.5
+    keeps = np.abs(ancilla[inputs, inputs]) > 0.5
+    if not np.all(flips ^ keeps):
+        return False
+    relative = diagonal * np.where(flips, -1, 1)
+    return bool(np.allclose(relative, relative[0]))
+
+
+def success_probability(algorithm, n, spec, counts):
+    shots = sum(counts.values())
+    zeros = counts.get("0" * n, 0) / shots
+    if algorithm == "dj":
+        # DJ succeeds when it classifies the oracle: all zeros iff the function is constant
+        return zeros if spec[0] == "constant" else 1 - zeros
+    expected = next(iter(analytic_distribution(n, spec)))
+    return counts.get(expected, 0) / shots
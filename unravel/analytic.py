@@ -0,0 +1,43 @@
+# ########## Analytic Sampler ##########
+import numpy as np
+
+from unravel.counts import outcome_dtype
+from unravel.oracles import expected_outcome, oracle_mask
+
+
+ANALYTIC_BACKEND_NAME = "analytic_sampler"
+
+
+# Exact measurement distribution of DJ / BV for an oracle spec:
+#   ("constant", output)            -> all zeros
+#   ("balanced", xGates, cxGates)   -> the CX mask (qubit 0 is the rightmost bit)
+#   ("bv", s)                       -> the secret bitstring s
+def analytic_distribution(n, spec):
+    return {format(expected_outcome(oracle_mask(n, spec)), f"0{n}b"): 1.0}
+
+
+def sample_counts(distribution, shots=1024, seed=None):
+    outcomes = list(distribution)
+    probabilities = np.fromiter(distribution.values(), dtype=float, count=len(outcomes))
+    rng = np.random.default_rng(seed)
+    samples = rng.choice(len(outcomes), size=shots, p=probabilities / probabilities.sum())
+    frequencies = np.bincount(samples, minlength=len(outcomes))
+    return {outcome: int(count) for outcome, count in zip(outcomes, frequencies) if count}
+
+
+def sample_memory(distribution, shots=1024, seed=None):
+    # The same draw shot by shot, as packed outcomes (qubit 0 in bit 0) for per-shot analytics
+    outcomes = list(distribution)
+    values = np.array([int(outcome, 2) for outcome in outcomes], dtype=outcome_dtype(len(outcomes[0])))
+    probabilities = np.fromiter(distribution.values(), dtype=float, count=len(outcomes))
+    rng = np.random.default_rng(seed)
+    return values[rng.choice(len(outcomes), size=shots, p=probabilities / probabilities.sum())]
+
+
+def run_analytic(n, spec, shots=1024, seed=None):
+    return sample_counts(analytic_distribution(n, spec), shots=shots, seed=seed)
+
+
+def run_analytic_batch(n, specs, shots=1024, seed=None):
+    rng = np.random.default_rng(seed)
+    return [run_analytic(n, spec, shots=shots, seed=rng) for spec in specs]
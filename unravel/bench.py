@@ -0,0 +1,122 @@
+# ########## Benchmark Suite ##########
+import json
+import platform
+import statistics
+import time
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import qiskit
+import qiskit_aer
+from qiskit import transpile
+from qiskit.providers.basic_provider import BasicProvider
+from qiskit.visualization import circuit_drawer, plot_histogram
+from qiskit_aer import AerSimulator
+
+from unravel.analytic import sample_counts
+from unravel.counts import top_counts
+from unravel.bernstein_vazirani import BVOracle, BernsteinVaziraniAlgo, generate_secret_bitstring
+from unravel.deutsch_jozsa import BalancedFunctionOracle, ConstantFunctionOracle, DeustchJoszaAlgo, generate_balanced_bitstring
+
+
+BENCH_N = (2, 4, 6, 8, 10)
+BENCH_SHOTS = (1024, 8192)
+DEFAULT_THRESHOLD = 0.25  # flag stages that got more than 25% slower
+
+
+def time_call(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return {"min_s": min(timings), "median_s": statistics.median(timings), "repeat": repeat}
+
+
+def draw(circuit):
+    fig = circuit_drawer(circuit, output="mpl")
+    plt.close(fig)
+
+
+def histogram(counts):
+    fig = plot_histogram(counts)
+    plt.close(fig)
+
+
+def benchmark_cases(n_values=BENCH_N, shots_values=BENCH_SHOTS):
+    # (case name, fn) for every stage of the pages, across the n x shots grid
+    basic = BasicProvider().get_backend("basic_simulator")
+    aer = AerSimulator()
+    for n in n_values:
+        balanced = generate_balanced_bitstring(n, seed=0)
+        secret = generate_secret_bitstring(n, seed=0)
+        dj_oracle = BalancedFunctionOracle(n, balanced, balanced)
+        bv_oracle = BVOracle(n, secret)
+        dj_circuit = DeustchJoszaAlgo(n, dj_oracle)
+        bv_circuit = BernsteinVaziraniAlgo(n, bv_oracle)
+        basic_circuit = transpile(dj_circuit, backend=basic)
+        aer_circuit = transpile(dj_circuit, backend=aer)
+
+        yield f"oracle.constant[n={n}]", lambda n=n: ConstantFunctionOracle(n, 1)
+        yield f"oracle.balanced[n={n}]", lambda n=n, b=balanced: BalancedFunctionOracle(n, b, b)
+        yield f"oracle.bv[n={n}]", lambda n=n, s=secret: BVOracle(n, s)
+        yield f"circuit.dj[n={n}]", lambda n=n, o=dj_oracle: DeustchJoszaAlgo(n, o)
+        yield f"circuit.bv[n={n}]", lambda n=n, o=bv_oracle: BernsteinVaziraniAlgo(n, o)
+        yield f"transpile.basic[n={n}]", lambda c=dj_circuit: transpile(c, backend=basic)
+        yield f"transpile.aer[n={n}]", lambda c=dj_circuit: transpile(c, backend=aer)
+        yield f"draw.mpl[n={n}]", lambda c=dj_circuit: draw(c)
+        for shots in shots_values:
+            # Uniform counts stand in for noisy or large outcome spaces
+            uniform = sample_counts({format(k, f"0{n}b"): 1.0 for k in range(2**n)}, shots=shots, seed=0)
+            yield f"run.basic[n={n},shots={shots}]", lambda c=basic_circuit, s=shots: basic.run(c, shots=s).result()
+            yield f"run.aer[n={n},shots={shots}]", lambda c=aer_circuit, s=shots: aer.run(c, shots=s).result()
+            yield f"plot.histogram[n={n},shots={shots}]", lambda counts=uniform: histogram(counts)
+            yield f"counts.top[n={n},shots={shots}]", lambda counts=uniform: top_counts(counts)
+
+
+def run_benchmarks(n_values=BENCH_N, shots_values=BENCH_SHOTS, repeat=5, progress=None):
+    results = {}
+    for name, fn in benchmark_cases(n_values, shots_values):
+        fn()  # warm up caches and lazy imports so they don't count against the first repeat
+        results[name] = time_call(fn, repeat)
+        if progress is not None:
+            progress(name, results[name])
+    return {
+        "metadata": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "qiskit": qiskit.__version__,
+            "qiskit_aer": qiskit_aer.__version__,
+            "n_values": list(n_values),
+            "shots_values": list(shots_values),
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def compare_benchmarks(baseline, current, threshold=DEFAULT_THRESHOLD):
+    # Rows of (case, baseline min, current min, ratio, regressed) for the cases both runs share
+    rows = []
+    for name, result in current["results"].items():
+        if name not in baseline["results"]:
+            continue
+        before = baseline["results"][name]["min_s"]
+        after = result["min_s"]
+        ratio = after / before if before > 0 else float("inf")
+        rows.append((name, before, after, ratio, ratio > 1 + threshold))
+    return rows
+
+
+def load(path):
+    with open(path) as file:
+        return json.load(file)
+
+
+def save(report, path):
+    with open(path, "w") as file:
+        json.dump(report, file, indent=2)
@@ -0,0 +1,24 @@
+from random import Random
+
+from unravel.oracles import oracle_mask
+from unravel.templates import assemble_query, mask_oracle
+
+
+# ########## Bernstien Vazirani Algorithm ##########
+def generate_secret_bitstring(n, seed=None):
+    rng = Random(seed)
+    return "".join(rng.choice("01") for _ in range(n))
+
+
+# Oracle to implement bitstring multiplication with input state
+def BVOracle(n, s="", synthesis="chain"):
+    s = s or generate_secret_bitstring(n)  # the hidden binary string
+
+    # s is read most significant bit first, so s[0] controls qubit n - 1
+    return mask_oracle(n, oracle_mask(n, ("bv", s)), synthesis=synthesis)
+
+
+def BernsteinVaziraniAlgo(n, bv_oracle):
+    # n qubits, plus one ancilla qubit unless the oracle is a phase oracle, and n classical bits for the output.
+    # Hadamards, oracle, Hadamards and measurement, with the fixed layers taken from cached templates
+    return assemble_query(n, bv_oracle, final_barrier=False)
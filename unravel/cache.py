@@ -0,0 +1,113 @@
+# ########## Circuit / Transpile / Diagram Cache ##########
+import hashlib
+from collections import OrderedDict
+from io import BytesIO
+from threading import Lock
+
+from qiskit import qasm2
+
+from unravel.transpiling import transpile_circuits, transpile_key
+
+
+# Size-bounded least-recently-used cache, shared by every session of the server process
+class LRUCache:
+    def __init__(self, maxsize=64):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return default
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def get_or_build(self, key, build):
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = build()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+
+# Circuits are keyed by (algorithm, n, oracle spec), plus the backend name and any
+# non-default transpiler options once transpiled;
+# diagrams by circuit hash and drawing options
+CIRCUIT_CACHE = LRUCache(maxsize=128)
+TRANSPILE_CACHE = LRUCache(maxsize=128)
+DIAGRAM_CACHE = LRUCache(maxsize=32)
+
+
+def cached_circuit(key, build):
+    return CIRCUIT_CACHE.get_or_build(key, build)
+
+
+def cached_transpile(keys, circuits, backend, transpile_options=None):
+    # Circuits missing from the cache are transpiled together in a single transpile call
+    keys = [(*key, backend.name, *transpile_key(transpile_options)) for key in keys]
+    transpiled = [TRANSPILE_CACHE.get(key) for key in keys]
+    missing = [index for index, circuit in enumerate(transpiled) if circuit is None]
+    if missing:
+        fresh = transpile_circuits([circuits[index] for index in missing], backend, transpile_options)
+        for index, circuit in zip(missing, fresh):
+            TRANSPILE_CACHE.put(keys[index], circuit)
+            transpiled[index] = circuit
+    return transpiled
+
+
+# Diagram formats and the default fold width of each (characters for text, gate columns otherwise)
+DIAGRAM_FOLDS = {"text": 80, "svg": 25, "mpl": 25}
+
+
+def circuit_hash(circuit):
+    # Same digest for the same gates in every session and process, whatever key the circuit was built under.
+    # OpenQASM 2 has no global phase, and the drawer prints it, so it is hashed alongside
+    return hashlib.sha256(f"{circuit.global_phase}\n{qasm2.dumps(circuit)}".encode()).hexdigest()
+
+
+def render_circuit(circuit, mode="mpl", fold=None, plot_barriers=True):
+    # Text diagrams come back as a string, SVG as an XML string and mpl as PNG bytes
+    fold = DIAGRAM_FOLDS[mode] if fold is None else fold
+    if mode == "text":
+        from qiskit.visualization import circuit_drawer
+
+        return str(circuit_drawer(circuit, output="text", fold=fold, plot_barriers=plot_barriers))
+
+    # matplotlib and the drawer are imported on the first diagram, not when the cache is imported
+    import matplotlib.pyplot as plt
+    from qiskit.visualization import circuit_drawer
+
+    fig = circuit_drawer(circuit, output="mpl", fold=fold, plot_barriers=plot_barriers)
+    buffer = BytesIO()
+    fig.savefig(buffer, format="svg" if mode == "svg" else "png", bbox_inches="tight")
+    plt.close(fig)
+    return buffer.getvalue().decode() if mode == "svg" else buffer.getvalue()
+
+
+def cached_diagram(circuit, mode="mpl", fold=None, plot_barriers=True):
+    key = (circuit_hash(circuit), mode, fold, plot_barriers)
+    return DIAGRAM_CACHE.get_or_build(key, lambda: render_circuit(circuit, mode, fold, plot_barriers))
@@ -0,0 +1,315 @@
+# ########## Command Line Interface ##########
+import argparse
+import json
+import os
+import sys
+import time
+
+from unravel.algorithms import ALGORITHM_NAMES, ORACLE_KINDS, oracle_spec
+from unravel.analytic import ANALYTIC_BACKEND_NAME
+from unravel.counts import MEMORY_MAX_BITS
+from unravel.execution import PROVIDERS
+from unravel.gallery import GALLERY_N, GALLERY_PATH, GALLERY_SEEDS
+from unravel.hardware import FAKE_DEVICES
+from unravel.parity import ORACLE_SYNTHESES
+from unravel.planner import MemoryBudgetError
+from unravel.stabilizer import ENGINE_QUBIT_LIMITS
+from unravel.transpiling import COUPLING_PRESETS, DEFAULT_TRANSPILE_OPTIONS, OPTIMIZATION_LEVELS
+
+
+def positive_int(value):
+    # Qubit, shot, seed and job counts: zero or less would only fail deep inside qiskit or as a division by zero
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, not {value}")
+    return number
+
+
+def run_command(args):
+    from unravel.execution import backend_names, run_algorithm
+
+    if args.secret is not None:
+        if args.algorithm != "bv" or len(args.secret) != args.n or set(args.secret) - set("01"):
+            raise SystemExit(f"--secret needs the bv algorithm and {args.n} zeros and ones")
+        spec = ("bv", args.secret)
+        oracle = "secret"
+    else:
+        oracle = args.oracle or ORACLE_KINDS[args.algorithm][-1]
+        if oracle not in ORACLE_KINDS[args.algorithm]:
+            raise SystemExit(f"--oracle for {args.algorithm} must be one of {', '.join(ORACLE_KINDS[args.algorithm])}")
+        spec = oracle_spec(args.algorithm, oracle, args.n, args.seed)
+
+    if args.backend != ANALYTIC_BACKEND_NAME and args.backend not in backend_names(args.provider):
+        names = ", ".join([*backend_names(args.provider), ANALYTIC_BACKEND_NAME])
+        raise SystemExit(f"--backend for the {args.provider} provider must be one of {names}")
+    engine = args.engine.capitalize()
+    # A phase oracle needs no ancilla, so the statevector fits one more input qubit
+    limit = ENGINE_QUBIT_LIMITS[engine] + (args.phase_oracle and engine == "Statevector")
+    if args.backend != ANALYTIC_BACKEND_NAME and args.n > limit:
+        raise SystemExit(f"The {engine} engine supports at most {limit} qubits")
+    if args.noise is not None:
+        from unravel.noise import device_qubits
+
+        if args.n + (not args.phase_oracle) > device_qubits(args.noise):
+            raise SystemExit(f"{args.noise} has only {device_qubits(args.noise)} qubits")
+    memory = args.memory or args.save_memory is not None
+    if memory and args.n > MEMORY_MAX_BITS:
+        raise SystemExit(f"Per-shot memory supports at most {MEMORY_MAX_BITS} qubits")
+
+    try:
+        result = run_algorithm(
+            args.algorithm, args.n, spec, shots=args.shots, engine=engine, provider_name=args.provider, backend_name=args.backend,
+            use_store=args.reuse_results, phase_oracle=args.phase_oracle, synthesis=args.synthesis,
+            transpile_options={"optimization_level": args.optimization_level, "coupling": args.coupling}, noise=args.noise,
+            memory=memory,
+        )
+    except MemoryBudgetError as error:
+        raise SystemExit(str(error))
+    result.update(oracle=oracle, seed=args.seed)
+    shots_memory = result.pop("memory")
+    if args.save_memory is not None:
+        import numpy as np
+
+        if shots_memory is None:
+            raise SystemExit("Too many shots to keep per-shot memory; only the statistics were recorded")
+        np.save(args.save_memory, shots_memory)
+    if args.json:
+        json.dump(result, sys.stdout)
+        sys.stdout.write("\n")
+        return
+    print(f"{ALGORITHM_NAMES[args.algorithm]}, n={args.n}, oracle={oracle}, spec={tuple(spec)}")
+    if args.noise is not None:
+        print(f"{args.shots} shots with the {args.noise} noise model in {result['total_s']:.3f}s")
+    else:
+        print(f"{args.shots} shots on {args.backend} ({engine}) in {result['total_s']:.3f}s")
+    if result["plan"]:
+        print(f"Simulation method: {result['plan']}")
+    for outcome, count in sorted(result["counts"].items(), key=lambda item: -item[1]):
+        print(f"  {outcome}  {count}")
+    print(f"Success probability: {result['success_probability']:.4f}")
+    if result["shot_stats"] is not None:
+        stats = result["shot_stats"]
+        print(f"Mean Hamming distance from {stats['expected']}: {stats['mean_hamming']:.4f}")
+        print("Hamming distances: " + " ".join(f"{distance}:{count}" for distance, count in enumerate(stats["hamming"]) if count))
+        print("P(1) per qubit: " + " ".join(f"q{qubit}={p:.3f}" for qubit, p in enumerate(stats["marginals"])))
+    if args.save_memory is not None:
+        print(f"Saved {len(shots_memory)} packed shots ({shots_memory.dtype}) to {args.save_memory}")
+
+
+def bench_run_command(args):
+    from unravel.bench import run_benchmarks, save
+
+    def progress(name, result):
+        print(f"{name:<40} {result['min_s'] * 1000:10.3f} ms")
+
+    report = run_benchmarks(args.n, args.shots, repeat=args.repeat, progress=progress)
+    save(report, args.out)
+    print(f"Saved {len(report['results'])} results to {args.out}")
+
+
+def bench_compare_command(args):
+    from unravel.bench import compare_benchmarks, load
+
+    rows = compare_benchmarks(load(args.baseline), load(args.current), threshold=args.threshold)
+    for name, before, after, ratio, regressed in rows:
+        flag = "REGRESSION" if regressed else ""
+        print(f"{name:<40} {before * 1000:10.3f} ms {after * 1000:10.3f} ms {ratio:6.2f}x {flag}")
+    regressions = sum(row[-1] for row in rows)
+    print(f"{regressions} of {len(rows)} cases slower than {1 + args.threshold:.2f}x the baseline")
+    if regressions:
+        raise SystemExit(1)
+
+
+def store_stats_command(args):
+    from unravel.store import get_result_store
+
+    stats = get_result_store().stats()
+    print(f"{stats['rows']} stored runs, {stats['bytes'] / 2**20:.2f} of {stats['max_bytes'] / 2**20:.0f} MiB in {stats['path']}")
+
+
+def store_export_command(args):
+    from unravel.store import get_result_store
+
+    rows = get_result_store().export_csv(args.out)
+    print(f"Wrote {rows} stored runs to {args.out}")
+
+
+def store_clear_command(args):
+    from unravel.store import get_result_store
+
+    get_result_store().clear()
+    print("Result store cleared")
+
+
+def hardware_load_command(args):
+    from unravel.algorithms import build_circuit, oracle_spec, success_probability
+    from unravel.hardware import FAKE_PROVIDER_NAME, SubmitToHardware, get_hardware_jobs, get_hardware_session
+    from unravel.jobs import DONE, ERROR
+
+    # The IBM token is read from the environment so it never shows up in the shell history
+    token = None
+    if args.provider == "ibm":
+        token = os.environ.get("UNRAVEL_IBM_TOKEN")
+        if not token:
+            raise SystemExit("Set UNRAVEL_IBM_TOKEN to submit to IBM Quantum")
+    start = time.perf_counter()
+    session = get_hardware_session(FAKE_PROVIDER_NAME if args.provider == "fake" else "IBM Quantum", token)
+    session.get_backend(args.backend)
+    print(f"Connected to {args.backend} in {time.perf_counter() - start:.2f}s")
+
+    specs = [oracle_spec(args.algorithm, ORACLE_KINDS[args.algorithm][-1], args.n, seed) for seed in range(args.batch)]
+    circuits = [build_circuit(args.algorithm, args.n, spec) for spec in specs]
+    # Cache keys let every job after the first reuse the transpiled batch
+    keys = [(args.algorithm, args.n, spec) for spec in specs]
+    jobs = get_hardware_jobs()
+    submit_times = []
+    start = time.perf_counter()
+    for _ in range(args.jobs):
+        submitted = time.perf_counter()
+        job_id = SubmitToHardware(
+            circuits, session, args.backend, args.shots, keys, transpile_options={"optimization_level": 3}
+        )
+        submit_times.append((job_id, time.perf_counter() - submitted))
+    print(f"Submitted {args.jobs} jobs of {args.batch} circuits, mean {sum(t for _, t in submit_times) / args.jobs:.3f}s each")
+
+    pending = [job_id for job_id, _ in submit_times]
+    while pending:
+        time.sleep(args.poll)
+        pending = [job_id for job_id in pending if jobs.status(job_id) not in (DONE, ERROR)]
+    failed = [job_id for job_id, _ in submit_times if jobs.status(job_id) == ERROR]
+    probabilities = [
+        success_probability(args.algorithm, args.n, spec, counts)
+        for job_id, _ in submit_times if job_id not in failed
+        for spec, counts in zip(specs, jobs.result(job_id))
+    ]
+    print(f"All jobs finished in {time.perf_counter() - start:.2f}s, {len(failed)} failed")
+    if probabilities:
+        print(f"Mean success probability: {sum(probabilities) / len(probabilities):.4f}")
+
+
+def gallery_build_command(args):
+    from unravel.gallery import build_gallery, gallery_tasks
+
+    def progress(done, total):
+        if done == total or done % 20 == 0:
+            print(f"Built {done} of {total} entries")
+
+    start = time.perf_counter()
+    tasks = gallery_tasks(range(1, args.n_max + 1), args.seeds)
+    entries = build_gallery(args.out, tasks, max_workers=args.workers, progress=progress)
+    size = os.path.getsize(args.out)
+    print(f"Wrote {entries} entries ({size / 2**20:.2f} MiB) to {args.out} in {time.perf_counter() - start:.1f}s")
+
+
+def verify_command(args):
+    from unravel.verify import verify_cases, verify_run_paths
+
+    def progress(done, total, case, problems):
+        algorithm, n, spec, phase_oracle, synthesis, engine = case
+        for problem in problems:
+            oracle = "phase" if phase_oracle else synthesis
+            print(f"FAIL {algorithm} n={n} spec={tuple(spec)} oracle={oracle} engine={engine}: {problem}")
+
+    engines = [engine.capitalize() for engine in args.engine]
+    cases = verify_cases(args.algorithm, range(1, args.n_max + 1), range(args.seeds), engines)
+    start = time.perf_counter()
+    failures = verify_run_paths(cases, args.shots, progress)
+    print(f"Checked {len(cases)} runs in {time.perf_counter() - start:.1f}s: {len(failures)} failed")
+    if failures:
+        raise SystemExit(1)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="unravel", description="Run UnravelQuantum algorithms without Streamlit")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Build and run one algorithm circuit")
+    run.add_argument("algorithm", choices=sorted(ALGORITHM_NAMES))
+    run.add_argument("--n", type=positive_int, default=3, help="number of input qubits")
+    run.add_argument("--oracle", help="oracle kind: constant0, constant1 or balanced for dj; random for bv")
+    run.add_argument("--secret", help="secret bitstring for bv, instead of a random one")
+    run.add_argument("--seed", type=int, default=0, help="seed for random oracles")
+    run.add_argument("--shots", type=positive_int, default=1024)
+    run.add_argument("--engine", choices=["statevector", "stabilizer", "auto"], default="statevector")
+    run.add_argument("--provider", choices=sorted(PROVIDERS), default="BasicAer", help="provider the backend belongs to")
+    run.add_argument("--backend", default="basic_simulator", help=f"backend name of the provider, or {ANALYTIC_BACKEND_NAME}")
+    run.add_argument("--phase-oracle", action="store_true", help="use the ancilla-free phase oracle (n qubits, not n + 1)")
+    run.add_argument("--synthesis", choices=ORACLE_SYNTHESES, default="chain", help="oracle CX layout: chain, or log-depth tree")
+    run.add_argument(
+        "--optimization-level", type=int, choices=OPTIMIZATION_LEVELS, default=DEFAULT_TRANSPILE_OPTIONS["optimization_level"]
+    )
+    run.add_argument(
+        "--coupling", choices=COUPLING_PRESETS, default=DEFAULT_TRANSPILE_OPTIONS["coupling"], help="qubit connectivity to route for"
+    )
+    run.add_argument("--noise", choices=FAKE_DEVICES, help="simulate with the noise model of this fake device")
+    run.add_argument("--memory", action="store_true", help="record every shot and report Hamming distances and per-qubit marginals")
+    run.add_argument("--save-memory", metavar="PATH", help="save the per-shot outcomes as a packed NumPy .npy array (implies --memory)")
+    run.add_argument("--json", action="store_true", help="print the result as JSON")
+    run.add_argument(
+        "--reuse-results", action="store_true", help="return stored counts for an identical earlier run, and store new ones"
+    )
+    run.set_defaults(handler=run_command)
+
+    bench = commands.add_parser("bench", help="Time every stage of the pages and compare against a baseline")
+    bench_commands = bench.add_subparsers(dest="bench_command", required=True)
+    bench_run = bench_commands.add_parser("run", help="Run the benchmark grid and save the results as JSON")
+    bench_run.add_argument("--out", default="benchmark.json", help="where to write the JSON results")
+    bench_run.add_argument("--n", type=positive_int, nargs="+", default=[2, 4, 6, 8, 10], help="qubit counts to benchmark")
+    bench_run.add_argument("--shots", type=positive_int, nargs="+", default=[1024, 8192], help="shot counts to benchmark")
+    bench_run.add_argument("--repeat", type=positive_int, default=5, help="timed repeats per case; the fastest is kept")
+    bench_run.set_defaults(handler=bench_run_command)
+    bench_compare = bench_commands.add_parser("compare", help="Flag cases that regressed against a baseline")
+    bench_compare.add_argument("baseline")
+    bench_compare.add_argument("current")
+    bench_compare.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown, 0.25 means 25%%")
+    bench_compare.set_defaults(handler=bench_compare_command)
+
+    store = commands.add_parser("store", help="Inspect, export or clear the persistent result store")
+    store_commands = store.add_subparsers(dest="store_command", required=True)
+    store_commands.add_parser("stats", help="Show how many runs are stored").set_defaults(handler=store_stats_command)
+    store_export = store_commands.add_parser("export", help="Write every stored run to a CSV file")
+    store_export.add_argument("--out", default="results.csv", help="where to write the CSV")
+    store_export.set_defaults(handler=store_export_command)
+    store_commands.add_parser("clear", help="Delete every stored run").set_defaults(handler=store_clear_command)
+
+    verify = commands.add_parser(
+        "verify", help="Run every oracle through the simulators and check the counts against the analytic sampler"
+    )
+    verify.add_argument("--algorithm", choices=sorted(ALGORITHM_NAMES), nargs="+", default=sorted(ALGORITHM_NAMES))
+    verify.add_argument("--n-max", type=positive_int, default=6, help="largest number of input qubits")
+    verify.add_argument("--seeds", type=positive_int, default=3, help="random oracles per setting")
+    verify.add_argument("--shots", type=positive_int, default=256)
+    verify.add_argument("--engine", choices=["statevector", "stabilizer"], nargs="+", default=["statevector", "stabilizer"])
+    verify.set_defaults(handler=verify_command)
+
+    gallery = commands.add_parser("gallery", help="Precompute the pages' default circuits, diagrams and counts")
+    gallery_commands = gallery.add_subparsers(dest="gallery_command", required=True)
+    gallery_build = gallery_commands.add_parser("build", help="Build the gallery bundle the pages load at startup")
+    gallery_build.add_argument("--out", default=GALLERY_PATH, help="where to write the bundle")
+    gallery_build.add_argument("--n-max", type=positive_int, default=GALLERY_N[-1], help="largest number of input qubits")
+    gallery_build.add_argument("--seeds", type=positive_int, default=GALLERY_SEEDS, help="random oracles per setting")
+    gallery_build.add_argument("--workers", type=positive_int, help="worker processes; defaults to one per CPU")
+    gallery_build.set_defaults(handler=gallery_build_command)
+
+    hardware = commands.add_parser("hardware", help="Submit jobs to IBM Quantum, or to a local fake device")
+    hardware_commands = hardware.add_subparsers(dest="hardware_command", required=True)
+    hardware_load = hardware_commands.add_parser("load", help="Submit many batched jobs at once and poll them to completion")
+    hardware_load.add_argument("--provider", choices=["fake", "ibm"], default="fake")
+    hardware_load.add_argument("--backend", default="fake_27q_pulse_v1", help="device name")
+    hardware_load.add_argument("--algorithm", choices=sorted(ALGORITHM_NAMES), default="bv")
+    hardware_load.add_argument("--n", type=positive_int, default=4, help="number of input qubits")
+    hardware_load.add_argument("--jobs", type=positive_int, default=10, help="jobs to submit")
+    hardware_load.add_argument("--batch", type=positive_int, default=4, help="circuits per job, each with its own random oracle")
+    hardware_load.add_argument("--shots", type=positive_int, default=1024)
+    hardware_load.add_argument("--poll", type=float, default=1.0, help="seconds between status checks")
+    hardware_load.set_defaults(handler=hardware_load_command)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+# ########## Result Counts ##########
+import heapq
+
+import numpy as np
+
+
+OTHER_OUTCOMES = "other"
+MEMORY_MAX_BITS = 64  # per-shot outcomes are packed into at most one uint64 each
+
+
+def top_counts(counts, k=16):
+    # The k most frequent outcomes in bitstring order, with everything else summed into one bucket.
+    # Keeps charts and tables a fixed size however many distinct bitstrings a run produced.
+    if len(counts) <= k:
+        return dict(sorted(counts.items()))
+    top = dict(sorted(heapq.nlargest(k, counts.items(), key=lambda item: item[1])))
+    top[OTHER_OUTCOMES] = sum(counts.values()) - sum(top.values())
+    return top
+
+
+def outcome_dtype(num_bits):
+    # Smallest unsigned integer holding one outcome: a million 10-qubit shots take 2 MB, not a list of strings
+    for dtype in (np.uint8, np.uint16, np.uint32, np.uint64):
+        if num_bits <= np.iinfo(dtype).bits:
+            return dtype
+    raise ValueError(f"Per-shot memory packs at most {MEMORY_MAX_BITS} measured bits, got {num_bits}")
+
+
+def pack_bits(bits):
+    # Rows of 0/1 with column j holding clbit j, packed into one integer per row (clbit 0 is bit 0)
+    packed = np.zeros(bits.shape[0], dtype=outcome_dtype(bits.shape[1]))
+    for column in range(bits.shape[1] - 1, -1, -1):
+        packed <<= 1
+        packed |= bits[:, column]
+    return packed
+
+
+def memory_to_array(memory):
+    # Bitstrings from result.get_memory() as packed integers, parsed as one byte matrix rather than shot by shot
+    if not memory:
+        return np.zeros(0, dtype=np.uint8)
+    characters = np.array(memory, dtype=f"S{len(memory[0])}").view(np.uint8).reshape(len(memory), -1)
+    characters = characters[:, characters[0] != ord(" ")]  # separators between classical registers
+    # The leftmost character is the highest clbit
+    return pack_bits(characters[:, ::-1] - ord("0"))
+
+
+def counts_to_arrays(counts):
+    # (outcomes, frequencies): a counts dict in the packed form, for statistics weighted by frequency
+    outcomes = memory_to_array(list(counts))
+    return outcomes, np.fromiter(counts.values(), dtype=np.int64, count=len(counts))
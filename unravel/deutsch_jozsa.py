@@ -0,0 +1,36 @@
+from random import Random
+
+from unravel.oracles import OracleMask, oracle_mask
+from unravel.templates import assemble_query, mask_oracle
+
+
+# ########## Deustch Josza Algorithm ##########
+def generate_balanced_bitstring(n, seed=None):
+    # An all-zeros CX string would make the oracle constant, so draw until at least one CX is placed
+    rng = Random(seed)
+    while True:
+        bitstring = "".join(rng.choice("01") for _ in range(n))
+        if "1" in bitstring:
+            return bitstring
+
+def ConstantFunctionOracle(n, output):
+    # n input qubits, 1 ancillia qubit for |->; an output of 1 is a single X on the ancilla
+    if output not in (0, 1):
+        return "Error: Invalid function output"
+    return mask_oracle(n, OracleMask("constant", output=output))
+
+def BalancedFunctionOracle(n, xGatesString, cxGatesString, synthesis="chain"):
+    if len(xGatesString) != n:
+        return "Error: Invalid length of X Gate String"
+    if len(cxGatesString) != n:
+        return "Error: Invalid length of CX Gate String"
+
+    # X-gates on the qubits set in xGatesString around CX-gates from the qubits set in cxGatesString,
+    # placed as a chain or a log-depth tree
+    return mask_oracle(n, oracle_mask(n, ("balanced", xGatesString, cxGatesString)), synthesis=synthesis)
+
+
+def DeustchJoszaAlgo(n, FunctionOracle):
+    # H-gates, |-> on the ancilla (ancilla oracles only), the oracle, H-gates again and measurement,
+    # with the fixed layers taken from cached templates
+    return assemble_query(n, FunctionOracle, final_barrier=True)
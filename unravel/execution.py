@@ -0,0 +1,269 @@
+# ########## Circuit Execution ##########
+import os
+import time
+from functools import lru_cache
+from importlib import import_module
+
+import numpy as np
+
+from unravel.algorithms import build_circuit, oracle_style_key, success_probability
+from unravel.analytic import ANALYTIC_BACKEND_NAME, run_analytic
+from unravel.cache import cached_circuit, cached_transpile
+from unravel.counts import memory_to_array
+from unravel.jobs import MAX_CONCURRENT_JOBS
+from unravel.noise import get_noisy_backend, plan_noisy, route_to_device
+from unravel.planner import STABILIZER, plan_simulation
+from unravel.profiling import StageTimer, timed_stage
+from unravel.shots import MEMORY_CHUNK_SHOTS, MEMORY_KEEP_SHOTS, ShotRecord, ShotStats, sample_shot_record
+from unravel.stabilizer import is_clifford, run_stabilizer
+from unravel.store import get_result_store, run_fingerprint
+from unravel.transpiling import transpile_circuits
+
+
+# Provider name -> "module:class"; a provider's module is only imported once it is selected
+PROVIDERS = {
+    "BasicAer": "qiskit.providers.basic_provider:BasicProvider",
+    "Aer": "qiskit_aer:AerProvider",
+}
+
+AER_PRECISIONS = ["double", "single"]
+
+
+def load_provider_class(provider_name):
+    module_name, class_name = PROVIDERS[provider_name].split(":")
+    return getattr(import_module(module_name), class_name)
+
+
+# One provider instance (and its backend handles) per process, shared by every session and the CLI
+@lru_cache(maxsize=None)
+def get_provider(provider_name):
+    return load_provider_class(provider_name)()
+
+
+def backend_names(provider_name):
+    # Backends that can sample counts; Aer lists one entry per method under the same name
+    names = [backend.name for backend in get_provider(provider_name).backends()]
+    return [name for name in dict.fromkeys(names) if "unitary" not in name and "superop" not in name]
+
+
+def default_aer_options():
+    # Every concurrent job of the shared pool gets an equal share of the host's cores.
+    # Below 14 qubits splitting a statevector across threads costs more than it saves.
+    threads = max(1, (os.cpu_count() or 1) // MAX_CONCURRENT_JOBS)
+    return {
+        "max_parallel_threads": threads,
+        "max_parallel_shots": threads,
+        "precision": "double",
+        "statevector_parallel_threshold": 14,
+    }
+
+
+# One AerSimulator per simulation method, created the first time the planner picks it
+@lru_cache(maxsize=None)
+def get_aer_backend(method):
+    from qiskit_aer import AerSimulator
+
+    return AerSimulator(method=method)
+
+
+def RunCircuits(
+    circuits, provider, backend_name, shots=1024, engine="Statevector", cache_keys=None, timer=None, options=None,
+    use_store=False, transpile_options=None, noise=None, memory=False,
+):
+    # memory=True returns every shot as a packed NumPy array instead of counts; the result store only keeps counts
+    use_store = use_store and not memory
+    # With a noise model circuits are routed onto the device's coupling map, as they would be on hardware,
+    # and the planner then picks density matrix or statevector trajectories for the routed circuits
+    if noise is not None:
+        with timed_stage(timer, "transpile"):
+            routed = route_to_device(circuits, noise, transpile_options, cache_keys)
+        with timed_stage(timer, "plan"):
+            method = plan_simulation(routed, shots, noisy=True).method
+        aer_options = default_aer_options() if options is None else options
+        return RunOnBackend(
+            routed, get_noisy_backend(noise, method), shots, cache_keys, timer, method, aer_options, use_store,
+            memory=memory, transpiled=True,
+        )
+    # "Auto" lets the planner pick an Aer method for the batch; it raises if nothing fits the memory budget
+    if engine == "Auto":
+        with timed_stage(timer, "plan"):
+            method = plan_simulation(circuits, shots).method
+        if method != STABILIZER:
+            aer_options = default_aer_options() if options is None else options
+            return RunOnBackend(
+                circuits, get_aer_backend(method), shots, cache_keys, timer, method, aer_options, use_store,
+                transpile_options, memory,
+            )
+    # Clifford-only circuits can skip the dense statevector and use a stabilizer tableau
+    if engine in ("Stabilizer", "Auto") and all(is_clifford(circuit) for circuit in circuits):
+        def run(batch):
+            return [run_stabilizer(circuit, shots=shots, memory=memory) for circuit in batch]
+
+        with timed_stage(timer, "stabilizer"):
+            return RunStored(circuits, "stabilizer", shots, None, run, cache_keys, timer) if use_store else run(circuits)
+    backend = provider.get_backend(backend_name)
+    return RunOnBackend(
+        circuits, backend, shots, cache_keys, timer, options=options, use_store=use_store,
+        transpile_options=transpile_options, memory=memory,
+    )
+
+
+def RunStored(circuits, backend_name, shots, options, run, cache_keys=None, timer=None):
+    # Serves circuits already in the result store and calls run() once for the rest, storing what it returns
+    store = get_result_store()
+    with timed_stage(timer, "result_store"):
+        fingerprints = [run_fingerprint(circuit, backend_name, shots, options) for circuit in circuits]
+        counts = [store.get(fingerprint) for fingerprint in fingerprints]
+    missing = [index for index, stored in enumerate(counts) if stored is None]
+    if missing:
+        start = time.perf_counter()
+        fresh = run([circuits[index] for index in missing])
+        run_s = (time.perf_counter() - start) / len(missing)
+        for index, result in zip(missing, fresh):
+            counts[index] = result
+            metadata = {
+                "cache_key": None if cache_keys is None else cache_keys[index],
+                "num_qubits": circuits[index].num_qubits,
+                "depth": circuits[index].depth(),
+            }
+            store.put(fingerprints[index], backend_name, shots, options, result, metadata, run_s)
+    return counts
+
+
+def RunOnBackend(
+    circuits, backend, shots=1024, cache_keys=None, timer=None, variant=None, options=None, use_store=False,
+    transpile_options=None, memory=False, transpiled=False,
+):
+    # Every circuit goes through a single transpile call and a single backend job; transpiled=True
+    # means circuits are already laid out for the backend.
+    # variant keeps transpile cache entries apart for backends that share a name (Aer methods)
+    if cache_keys is not None and variant is not None:
+        cache_keys = [(*key, variant) for key in cache_keys]
+    if transpiled:
+        transpiled_circuits = circuits
+    else:
+        with timed_stage(timer, "transpile"):
+            if cache_keys is None:
+                transpiled_circuits = transpile_circuits(circuits, backend, transpile_options)
+            else:
+                transpiled_circuits = cached_transpile(cache_keys, circuits, backend, transpile_options)
+
+    def run(batch):
+        with timed_stage(timer, "backend.run"):
+            job = backend.run(batch, shots=shots, memory=memory, **(options or {}))
+            results = job.result()
+        if memory:
+            return [memory_to_array(results.get_memory(index)) for index in range(len(batch))]
+        return [results.get_counts(index) for index in range(len(batch))]
+
+    if not use_store:
+        return run(transpiled_circuits)
+    backend_name = backend.name if variant is None else f"{backend.name}:{variant}"
+    return RunStored(transpiled_circuits, backend_name, shots, options, run, cache_keys, timer)
+
+
+def RunCircuit(
+    circuit, provider, backend_name, shots=1024, engine="Statevector", cache_key=None, timer=None, options=None,
+    use_store=False, transpile_options=None, noise=None, memory=False,
+):
+    cache_keys = None if cache_key is None else [cache_key]
+    return RunCircuits(
+        [circuit], provider, backend_name, shots, engine, cache_keys, timer, options, use_store, transpile_options, noise,
+        memory,
+    )[0]
+
+
+def RunShots(
+    circuit, provider, backend_name, algorithm, n, spec, shots=1024, engine="Statevector", cache_key=None, timer=None,
+    options=None, transpile_options=None, noise=None, keep_shots=MEMORY_KEEP_SHOTS,
+):
+    # Per-shot memory in jobs of at most MEMORY_CHUNK_SHOTS, each folded into the running statistics as it
+    # arrives. Packed outcomes are only kept for runs up to keep_shots, so millions of shots stay bounded
+    stats = ShotStats(algorithm, n, spec)
+    chunks = []
+    for start in range(0, shots, MEMORY_CHUNK_SHOTS):
+        outcomes = RunCircuit(
+            circuit, provider, backend_name, min(MEMORY_CHUNK_SHOTS, shots - start), engine, cache_key, timer, options,
+            transpile_options=transpile_options, noise=noise, memory=True,
+        )
+        with timed_stage(timer, "shot_stats"):
+            stats.update(outcomes)
+        if shots <= keep_shots:
+            chunks.append(outcomes)
+    return ShotRecord(stats, np.concatenate(chunks) if chunks else None)
+
+
+def compare_throughput(circuit, shots=1024, aer_options=None, cache_key=None):
+    # The same circuit on the reference simulator and on Aer. Only backend.run is compared;
+    # each circuit is transpiled once beforehand so the timings are not skewed by the transpiler
+    rows = []
+    aer_options = default_aer_options() if aer_options is None else aer_options
+    for provider_name, backend_name, options in [("BasicAer", "basic_simulator", None), ("Aer", "aer_simulator", aer_options)]:
+        backend = get_provider(provider_name).get_backend(backend_name)
+        keys = None if cache_key is None else [cache_key]
+        RunOnBackend([circuit], backend, 1, keys, options=options)
+        timer = StageTimer()
+        RunOnBackend([circuit], backend, shots, keys, timer, options=options)
+        run_s = next(record["wall_s"] for record in timer.drain() if record["stage"] == "backend.run")
+        rows.append({"provider": provider_name, "backend": backend_name, "run_s": run_s, "shots_per_s": shots / run_s})
+    return rows
+
+
+def run_algorithm(
+    algorithm, n, spec, shots=1024, engine="Statevector", provider_name="BasicAer", backend_name="basic_simulator", timer=None,
+    use_store=False, phase_oracle=False, synthesis="chain", transpile_options=None, noise=None, memory=False,
+):
+    # Oracle spec in, counts and run metadata out: the path shared by the CLI and batch tooling.
+    # memory=True also records every shot: "shot_stats" summarises them and "memory" holds the packed
+    # outcomes (None above MEMORY_KEEP_SHOTS)
+    start = time.perf_counter()
+    plan = None
+    record = None
+    if backend_name == ANALYTIC_BACKEND_NAME:
+        build_s = 0.0
+        with timed_stage(timer, "analytic"):
+            if memory:
+                record = sample_shot_record(algorithm, n, spec, shots)
+                counts = record.counts()
+            else:
+                counts = run_analytic(n, spec, shots=shots)
+    else:
+        key = (algorithm, n, spec, *oracle_style_key(phase_oracle, synthesis))
+        circuit = cached_circuit(
+            key, lambda: build_circuit(algorithm, n, spec, timer, phase_oracle=phase_oracle, synthesis=synthesis)
+        )
+        build_s = time.perf_counter() - start
+        if noise is not None:
+            plan = plan_noisy([circuit], noise, shots, transpile_options, [key])[1].describe()
+        elif engine == "Auto":
+            plan = plan_simulation(circuit, shots).describe()
+        if memory:
+            record = RunShots(
+                circuit, get_provider(provider_name), backend_name, algorithm, n, spec, shots, engine, key, timer,
+                transpile_options=transpile_options, noise=noise,
+            )
+            counts = record.counts()
+        else:
+            counts = RunCircuit(
+                circuit, get_provider(provider_name), backend_name, shots, engine, cache_key=key, timer=timer,
+                use_store=use_store, transpile_options=transpile_options, noise=noise,
+            )
+    return {
+        "algorithm": algorithm,
+        "n": n,
+        "spec": list(spec),
+        "engine": engine,
+        "phase_oracle": phase_oracle,
+        "synthesis": synthesis,
+        "transpile_options": transpile_options,
+        "noise": noise,
+        "plan": plan,
+        "backend": backend_name,
+        "shots": shots,
+        "counts": counts,
+        "success_probability": success_probability(algorithm, n, spec, counts),
+        "shot_stats": None if record is None else record.stats.summary(),
+        "memory": None if record is None else record.memory,
+        "build_s": build_s,
+        "total_s": time.perf_counter() - start,
+    }
@@ -0,0 +1,195 @@
+# ########## Precomputed Gallery ##########
+import json
+import logging
+import multiprocessing
+import os
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from io import BytesIO
+from threading import Lock
+
+from unravel.algorithms import ORACLE_KINDS, oracle_spec
+
+
+logger = logging.getLogger("unravel.gallery")
+
+# Built with `python -m unravel gallery build`; set UNRAVEL_GALLERY to load the bundle from elsewhere
+GALLERY_PATH = os.environ.get(
+    "UNRAVEL_GALLERY", os.path.join(os.path.expanduser("~"), ".cache", "unravel", "gallery.zip")
+)
+GALLERY_FORMAT = 1
+
+# The pages' defaults: every slider value, both constant functions and the first few seeds of each
+# random oracle, run on BasicAer at the default shot count
+GALLERY_N = range(1, 11)
+GALLERY_SEEDS = 8
+GALLERY_PROVIDER = "BasicAer"
+GALLERY_BACKEND = "basic_simulator"
+GALLERY_SHOTS = 1024
+
+
+def gallery_key(key):
+    # Circuit cache key as a string; specs are tuples of strings and ints, so repr is stable.
+    # Only plain (algorithm, n, spec) keys are in the bundle, so phase or tree keys never match
+    return repr(tuple(key))
+
+
+def gallery_tasks(n_values=GALLERY_N, seeds=GALLERY_SEEDS):
+    tasks = {}
+    for algorithm, kinds in ORACLE_KINDS.items():
+        for n in n_values:
+            for kind in kinds:
+                for seed in range(seeds):
+                    spec = oracle_spec(algorithm, kind, n, seed)
+                    tasks[(algorithm, n, spec)] = None
+    return list(tasks)
+
+
+def build_gallery_entry(task):
+    # Everything a page draws or runs for one default configuration, computed in a worker process
+    from qiskit import qpy
+
+    from unravel.algorithms import build_circuit
+    from unravel.cache import DIAGRAM_FOLDS, render_circuit
+    from unravel.execution import RunCircuit, get_provider
+    from unravel.parity import ORACLE_SYNTHESES
+    from unravel.transpiling import OPTIMIZATION_LEVELS, transpile_report
+
+    algorithm, n, spec = task
+    circuit = build_circuit(algorithm, n, spec)
+    collapsed = build_circuit(algorithm, n, spec, collapse_oracle=True)
+    buffer = BytesIO()
+    qpy.dump(circuit, buffer)
+
+    backend = get_provider(GALLERY_PROVIDER).get_backend(GALLERY_BACKEND)
+    report = []
+    for synthesis in ORACLE_SYNTHESES:
+        synthesised = circuit if synthesis == "chain" else build_circuit(algorithm, n, spec, synthesis=synthesis)
+        for level in OPTIMIZATION_LEVELS:
+            stats = transpile_report(synthesised, backend, {"optimization_level": level})
+            report.append({"oracle": synthesis, "optimization_level": level, **stats})
+    return {
+        "key": gallery_key(task),
+        "qpy": buffer.getvalue(),
+        "diagrams": {
+            "full": render_circuit(circuit, "text", DIAGRAM_FOLDS["text"]),
+            "collapsed": render_circuit(collapsed, "text", DIAGRAM_FOLDS["text"], plot_barriers=False),
+        },
+        "counts": RunCircuit(circuit, get_provider(GALLERY_PROVIDER), GALLERY_BACKEND, GALLERY_SHOTS),
+        "transpile_report": report,
+    }
+
+
+def build_gallery(path=GALLERY_PATH, tasks=None, max_workers=None, progress=None):
+    # Entries are built in spawned worker processes and written to one deflated zip:
+    # a JSON manifest with the counts, diagrams and stats, plus one QPY file per circuit
+    import qiskit
+
+    tasks = gallery_tasks() if tasks is None else tasks
+    entries = {}
+    circuits = {}
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as executor:
+        futures = [executor.submit(build_gallery_entry, task) for task in tasks]
+        for future in as_completed(futures):
+            entry = future.result()
+            name = f"circuits/{len(circuits)}.qpy"
+            circuits[name] = entry.pop("qpy")
+            entries[entry.pop("key")] = {**entry, "circuit": name}
+            if progress is not None:
+                progress(len(entries), len(tasks))
+
+    manifest = {
+        "format": GALLERY_FORMAT,
+        "qiskit": qiskit.__version__,
+        "built": time.time(),
+        "provider": GALLERY_PROVIDER,
+        "backend": GALLERY_BACKEND,
+        "shots": GALLERY_SHOTS,
+        "entries": entries,
+    }
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    # Written next to the bundle and moved into place, so a running server never reads half a file
+    partial = f"{path}.partial"
+    with zipfile.ZipFile(partial, "w", compression=zipfile.ZIP_DEFLATED) as bundle:
+        bundle.writestr("manifest.json", json.dumps(manifest))
+        for name, data in circuits.items():
+            bundle.writestr(name, data)
+    os.replace(partial, path)
+    return len(entries)
+
+
+# Read-only view of a bundle; everything is loaded into memory once, circuits are deserialised on demand
+class Gallery:
+    def __init__(self, path=GALLERY_PATH):
+        self.path = path
+        with zipfile.ZipFile(path) as bundle:
+            self.manifest = json.loads(bundle.read("manifest.json"))
+            self._circuits = {name: bundle.read(name) for name in bundle.namelist() if name.startswith("circuits/")}
+        self.entries = self.manifest["entries"]
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return gallery_key(key) in self.entries
+
+    def circuit(self, key):
+        from qiskit import qpy
+
+        entry = self.entries.get(gallery_key(key))
+        if entry is None:
+            return None
+        return qpy.load(BytesIO(self._circuits[entry["circuit"]]))[0]
+
+    def diagram(self, key, collapsed=False):
+        entry = self.entries.get(gallery_key(key))
+        return None if entry is None else entry["diagrams"]["collapsed" if collapsed else "full"]
+
+    def counts(self, key, backend_name, shots):
+        entry = self.entries.get(gallery_key(key))
+        if entry is None or backend_name != self.manifest["backend"] or shots != self.manifest["shots"]:
+            return None
+        return entry["counts"]
+
+    def transpile_report(self, key, backend_name):
+        entry = self.entries.get(gallery_key(key))
+        if entry is None or backend_name != self.manifest["backend"]:
+            return None
+        return entry["transpile_report"]
+
+
+_default_gallery = None
+_default_gallery_mtime = None
+_default_gallery_lock = Lock()
+
+
+def get_gallery():
+    # None when no bundle has been built, or when it was built with another qiskit version (QPY and
+    # drawings would not match). A rebuilt bundle is picked up on the next call without a restart
+    global _default_gallery, _default_gallery_mtime
+    import qiskit
+
+    with _default_gallery_lock:
+        try:
+            mtime = os.stat(GALLERY_PATH).st_mtime
+        except OSError:
+            _default_gallery = _default_gallery_mtime = None
+            return None
+        if mtime != _default_gallery_mtime:
+            _default_gallery_mtime = mtime
+            try:
+                gallery = Gallery(GALLERY_PATH)
+            except (OSError, KeyError, ValueError, zipfile.BadZipFile) as error:
+                logger.warning("Ignoring unreadable gallery %s: %s", GALLERY_PATH, error)
+                gallery = None
+            if gallery is not None and (
+                gallery.manifest.get("format") != GALLERY_FORMAT or gallery.manifest.get("qiskit") != qiskit.__version__
+            ):
+                logger.warning("Ignoring gallery %s built for another qiskit or format version", GALLERY_PATH)
+                gallery = None
+            _default_gallery = gallery
+        return _default_gallery
@@ -0,0 +1,173 @@
+# ########## Hardware Execution ##########
+import hashlib
+import time
+from collections import OrderedDict
+from importlib import import_module
+from threading import Lock
+
+from unravel.cache import LRUCache, cached_transpile
+from unravel.jobs import DONE, ERROR, QUEUED, RUNNING
+from unravel.transpiling import transpile_circuits
+
+
+# Provider name -> "module:class"; both are built from an API token, which the fake provider ignores
+HARDWARE_PROVIDERS = {
+    "IBM Quantum": "qiskit_ibm_provider:IBMProvider",
+    "Fake (local)": "unravel.hardware:FakeProvider",
+}
+FAKE_PROVIDER_NAME = "Fake (local)"
+
+# Snapshots of real IBM devices shipped with qiskit: their coupling maps, basis gates and noise.
+# Fake20QV1 is left out; its target makes VF2 layout fail at optimization level 1 and above
+FAKE_DEVICES = {
+    "fake_5q_v1": "Fake5QV1",
+    "fake_7q_pulse_v1": "Fake7QPulseV1",
+    "fake_27q_pulse_v1": "Fake27QPulseV1",
+    "fake_127q_pulse_v1": "Fake127QPulseV1",
+}
+
+
+# Offline stand-in for IBMProvider with the same backends()/get_backend() surface. Each device is
+# an AerSimulator carrying its coupling map, basis gates and noise model, built once per provider,
+# so jobs run locally and return immediately with a pollable job id
+class FakeProvider:
+    def __init__(self, token=None):
+        self._backends = {}
+        self._lock = Lock()
+
+    def backends(self):
+        return [self.get_backend(name) for name in FAKE_DEVICES]
+
+    def get_backend(self, name):
+        from qiskit.providers import fake_provider
+        from qiskit_aer import AerSimulator
+
+        if name not in FAKE_DEVICES:
+            raise ValueError(f"Unknown fake backend {name!r}")
+        with self._lock:
+            if name not in self._backends:
+                backend = AerSimulator.from_backend(getattr(fake_provider, FAKE_DEVICES[name])())
+                backend.name = name  # from_backend names it "aer_simulator(<name>)"
+                self._backends[name] = backend
+            return self._backends[name]
+
+
+# One authenticated provider and its backend handles, shared by every page session using the same key.
+# The token only lives in memory: nothing is written to the qiskit account file
+class HardwareSession:
+    def __init__(self, provider_name, api_key=None):
+        module_name, class_name = HARDWARE_PROVIDERS[provider_name].split(":")
+        self.provider_name = provider_name
+        self.provider = getattr(import_module(module_name), class_name)(token=api_key)
+        self._backends = {}
+        self._lock = Lock()
+
+    def backend_names(self):
+        with self._lock:
+            if not self._backends:
+                self._backends = {backend.name: backend for backend in self.provider.backends()}
+            return list(self._backends)
+
+    def get_backend(self, backend_name):
+        with self._lock:
+            if backend_name not in self._backends:
+                self._backends[backend_name] = self.provider.get_backend(backend_name)
+            return self._backends[backend_name]
+
+
+# Sessions are keyed by a hash of the API key, so the key itself is never held as a cache key
+HARDWARE_SESSIONS = LRUCache(maxsize=32)
+_sessions_lock = Lock()
+_session_build_locks = {}
+
+
+def get_hardware_session(provider_name, api_key=None):
+    # Logging in is a network call, so it holds only its own key's lock: concurrent sessions with the
+    # same key share one login, and sessions with other keys are not held up by it
+    key = (provider_name, hashlib.sha256((api_key or "").encode()).hexdigest())
+    with _sessions_lock:
+        build_lock = _session_build_locks.setdefault(key, Lock())
+    with build_lock:
+        return HARDWARE_SESSIONS.get_or_build(key, lambda: HardwareSession(provider_name, api_key))
+
+
+def job_state(status_name):
+    # Provider JobStatus names mapped onto the states the pages already show for simulator jobs
+    if status_name == "DONE":
+        return DONE
+    if status_name in ("ERROR", "CANCELLED"):
+        return ERROR
+    return RUNNING if status_name == "RUNNING" else QUEUED
+
+
+# Submitted provider jobs by job id. Pages and the CLI poll status() instead of blocking on result(),
+# and results are fetched once and kept so later polls do not go back to the provider
+class HardwareJobs:
+    def __init__(self, keep=256):
+        self.keep = keep
+        self._jobs = OrderedDict()
+        self._lock = Lock()
+
+    def add(self, job, backend_name, num_circuits, shots):
+        job_id = job.job_id()
+        with self._lock:
+            self._jobs[job_id] = {
+                "job": job,
+                "backend": backend_name,
+                "circuits": num_circuits,
+                "shots": shots,
+                "submitted": time.monotonic(),
+                "finished": None,
+                "counts": None,
+            }
+            while len(self._jobs) > self.keep:
+                self._jobs.popitem(last=False)
+        return job_id
+
+    def get(self, job_id):
+        return self._jobs.get(job_id)
+
+    def status(self, job_id):
+        record = self._jobs[job_id]
+        if record["counts"] is not None:
+            return DONE
+        state = job_state(record["job"].status().name)
+        if state in (DONE, ERROR) and record["finished"] is None:
+            record["finished"] = time.monotonic()
+        return state
+
+    def elapsed(self, job_id):
+        record = self._jobs[job_id]
+        return (record["finished"] or time.monotonic()) - record["submitted"]
+
+    def result(self, job_id):
+        record = self._jobs[job_id]
+        if record["counts"] is None:
+            result = record["job"].result()
+            record["counts"] = [result.get_counts(index) for index in range(record["circuits"])]
+        return record["counts"]
+
+
+_default_jobs = None
+_default_jobs_lock = Lock()
+
+
+def get_hardware_jobs():
+    global _default_jobs
+    with _default_jobs_lock:
+        if _default_jobs is None:
+            _default_jobs = HardwareJobs()
+        return _default_jobs
+
+
+def SubmitToHardware(circuits, session, backend_name, shots=1024, cache_keys=None, transpile_options=None):
+    # Every circuit goes into one provider job; returns its job id without waiting for the result.
+    # Routing always targets the device's own coupling map, so only the optimization level is taken
+    backend = session.get_backend(backend_name)
+    transpile_options = {**(transpile_options or {}), "coupling": "all-to-all"}
+    if cache_keys is None:
+        transpiled_circuits = transpile_circuits(circuits, backend, transpile_options)
+    else:
+        transpiled_circuits = cached_transpile(cache_keys, circuits, backend, transpile_options)
+    job = backend.run(transpiled_circuits, shots=shots)
+    return get_hardware_jobs().add(job, backend_name, len(circuits), shots)
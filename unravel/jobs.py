@@ -0,0 +1,132 @@
+# ########## Background Job Execution ##########
+import itertools
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from threading import BoundedSemaphore, Lock
+
+
+QUEUED, RUNNING, DONE, ERROR = "QUEUED", "RUNNING", "DONE", "ERROR"
+
+# Process-wide limits, shared by every session on the server
+MAX_CONCURRENT_JOBS = int(os.environ.get("UNRAVEL_MAX_CONCURRENT_JOBS", max(1, (os.cpu_count() or 2) // 2)))
+MAX_QUEUED_JOBS = int(os.environ.get("UNRAVEL_MAX_QUEUED_JOBS", 32))
+
+
+class QueueFullError(RuntimeError):
+    pass
+
+
+class Job:
+    def __init__(self, job_id):
+        self.job_id = job_id
+        self.future = None
+        self.submitted = time.monotonic()
+        self.started = None
+        self.finished = None
+
+    @property
+    def status(self):
+        if self.finished is not None and self.future.done():
+            return ERROR if self.future.exception() is not None else DONE
+        return QUEUED if self.started is None else RUNNING
+
+    @property
+    def elapsed(self):
+        return (self.finished or time.monotonic()) - self.submitted
+
+    @property
+    def wait_time(self):
+        return (self.started or time.monotonic()) - self.submitted
+
+
+# Runs backend jobs off the Streamlit script thread; pages keep only the job id in session state.
+# At most max_concurrent jobs simulate at once, the rest wait in FIFO order, and once
+# max_queued jobs are waiting new submissions are refused instead of piling up.
+class JobPool:
+    def __init__(self, max_concurrent=MAX_CONCURRENT_JOBS, max_queued=MAX_QUEUED_JOBS, keep_finished=256, history=100):
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self.keep_finished = keep_finished
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrent, thread_name_prefix="unravel-job")
+        self._admission = BoundedSemaphore(max_concurrent + max_queued)
+        self._jobs = {}
+        self._ids = itertools.count(1)
+        self._lock = Lock()
+        self._wait_times = deque(maxlen=history)
+        self._run_times = deque(maxlen=history)
+        self._rejected = 0
+
+    def submit(self, fn, *args, **kwargs):
+        if not self._admission.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise QueueFullError(f"The simulator queue is full ({self.max_queued} jobs waiting), please try again shortly")
+        with self._lock:
+            job = Job(next(self._ids))
+            self._jobs[job.job_id] = job
+            self._forget_oldest_finished()
+
+        def run():
+            job.started = time.monotonic()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                job.finished = time.monotonic()
+                with self._lock:
+                    self._wait_times.append(job.started - job.submitted)
+                    self._run_times.append(job.finished - job.started)
+                self._admission.release()
+
+        job.future = self._executor.submit(run)
+        return job.job_id
+
+    def get(self, job_id):
+        return self._jobs.get(job_id)
+
+    def queue_position(self, job_id):
+        # 1-based position among the jobs still waiting for a worker, or 0 once it has started
+        job = self._jobs.get(job_id)
+        if job is None or job.started is not None:
+            return 0
+        with self._lock:
+            waiting = [other for other in self._jobs.values() if other.started is None]
+        return 1 + sum(other.submitted < job.submitted for other in waiting)
+
+    def metrics(self):
+        with self._lock:
+            jobs = list(self._jobs.values())
+            wait_times = sorted(self._wait_times)
+            run_times = list(self._run_times)
+            rejected = self._rejected
+        return {
+            "queue_depth": sum(job.started is None for job in jobs),
+            "running": sum(job.started is not None and job.finished is None for job in jobs),
+            "max_concurrent": self.max_concurrent,
+            "max_queued": self.max_queued,
+            "rejected": rejected,
+            "mean_wait_s": sum(wait_times) / len(wait_times) if wait_times else 0.0,
+            "p95_wait_s": wait_times[int(0.95 * (len(wait_times) - 1))] if wait_times else 0.0,
+            "mean_run_s": sum(run_times) / len(run_times) if run_times else 0.0,
+        }
+
+    def result(self, job_id):
+        return self._jobs[job_id].future.result()
+
+    def _forget_oldest_finished(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished is not None]
+        for job_id in finished[: max(0, len(finished) - self.keep_finished)]:
+            del self._jobs[job_id]
+
+
+_default_pool = None
+_default_pool_lock = Lock()
+
+
+def get_job_pool():
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = JobPool()
+        return _default_pool
@@ -0,0 +1,55 @@
+# ########## Noisy Simulation ##########
+from functools import lru_cache
+
+from unravel.cache import cached_transpile
+from unravel.hardware import FAKE_DEVICES
+from unravel.planner import plan_simulation
+from unravel.transpiling import transpile_circuits
+
+
+IDEAL = "Ideal"
+
+
+# Device snapshots are a few hundred kB of calibration data each, so they are loaded once per process
+@lru_cache(maxsize=None)
+def device_snapshot(device):
+    from qiskit.providers import fake_provider
+
+    if device not in FAKE_DEVICES:
+        raise ValueError(f"Unknown noise model {device!r}")
+    return getattr(fake_provider, FAKE_DEVICES[device])()
+
+
+def device_qubits(device):
+    return device_snapshot(device).configuration().n_qubits
+
+
+def noise_devices(num_qubits):
+    # Devices large enough to hold a circuit of num_qubits qubits
+    return [device for device in FAKE_DEVICES if device_qubits(device) >= num_qubits]
+
+
+# One AerSimulator per (device, method) with the device's coupling map, basis gates and noise model.
+# Aer runs the shots of a job in parallel, so trajectories are batched rather than one job per realization
+@lru_cache(maxsize=None)
+def get_noisy_backend(device, method):
+    from qiskit_aer import AerSimulator
+
+    return AerSimulator.from_backend(device_snapshot(device), method=method)
+
+
+def route_to_device(circuits, device, transpile_options=None, cache_keys=None):
+    # Circuits laid out and routed on the device's own coupling map, so only the optimization level is taken.
+    # Every Aer method shares the device's target, so circuits are routed once, before a method is chosen
+    backend = get_noisy_backend(device, "automatic")
+    transpile_options = {**(transpile_options or {}), "coupling": "all-to-all"}
+    if cache_keys is None:
+        return transpile_circuits(circuits, backend, transpile_options)
+    return cached_transpile(cache_keys, circuits, backend, transpile_options)
+
+
+def plan_noisy(circuits, device, shots=1024, transpile_options=None, cache_keys=None):
+    # (routed circuits, plan). Routing can spread a circuit over more physical qubits than it has logical
+    # ones, so the method and the memory budget are checked on the routed circuits
+    routed = route_to_device(circuits, device, transpile_options, cache_keys)
+    return routed, plan_simulation(routed, shots, noisy=True)
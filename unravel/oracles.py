@@ -0,0 +1,60 @@
+# ########## Oracle Bitmasks ##########
+from typing import NamedTuple
+
+
+# Every DJ / BV oracle is a constant or a parity function, so a type tag and two integers describe it.
+# Bit q of a mask stands for input qubit q:
+#   constant  f(x) = output
+#   balanced  f(x) = parity((x ^ x_mask) & parity_mask)
+#   bv        f(x) = parity(x & parity_mask), with parity_mask the secret s read as a binary number
+class OracleMask(NamedTuple):
+    kind: str
+    output: int = 0
+    x_mask: int = 0
+    parity_mask: int = 0
+
+
+def bitstring_mask(bitstring):
+    # DJ gate strings list qubit 0 first: character q sets bit q
+    return int(bitstring[::-1], 2) if bitstring else 0
+
+
+def mask_qubits(mask):
+    return [qubit for qubit in range(mask.bit_length()) if mask >> qubit & 1]
+
+
+def parse_bitstring(bitstring, n):
+    # Bitstrings must have exactly n characters: a shorter one would silently move its gates to other qubits
+    if len(bitstring) != n or set(bitstring) - set("01"):
+        raise ValueError(f"Expected a bitstring of {n} zeros and ones, got {bitstring!r}")
+    return bitstring
+
+
+def oracle_mask(n, spec):
+    # Specs may carry bitstrings, as the pages and CLI write them, or integer masks directly:
+    #   ("constant", output), ("balanced", x, cx) and ("bv", s)
+    kind = spec[0]
+    if kind == "constant":
+        if spec[1] not in (0, 1):
+            raise ValueError(f"Constant oracles output 0 or 1, got {spec[1]!r}")
+        return OracleMask(kind, output=int(spec[1]))
+    if kind == "balanced":
+        x_mask, parity_mask = (
+            value if isinstance(value, int) else bitstring_mask(parse_bitstring(value, n)) for value in spec[1:3]
+        )
+        # With no CX the oracle is constant, and DJ would report a "balanced" function as constant
+        if parity_mask == 0:
+            raise ValueError(f"A balanced oracle needs at least one CX, got {spec!r}")
+        mask = OracleMask(kind, x_mask=x_mask, parity_mask=parity_mask)
+    elif kind == "bv":
+        mask = OracleMask(kind, parity_mask=spec[1] if isinstance(spec[1], int) else int(parse_bitstring(spec[1], n), 2))
+    else:
+        raise ValueError(f"Unknown oracle spec: {spec!r}")
+    if (mask.x_mask | mask.parity_mask) >> n:
+        raise ValueError(f"Oracle spec {spec!r} has bits beyond qubit {n - 1}")
+    return mask
+
+
+def expected_outcome(mask):
+    # The one outcome the noiseless circuit measures, as an integer with qubit 0 in bit 0
+    return mask.parity_mask
@@ -0,0 +1,33 @@
+# ########## Parity Network Synthesis ##########
+ORACLE_SYNTHESES = ["chain", "tree"]
+
+
+def parity_tree_layers(qubits):
+    # Pairs (control, target) per layer of a CX fan-in tree; the parity of qubits ends up on the returned root
+    layers = []
+    active = list(qubits)
+    while len(active) > 1:
+        layers.append([(active[i], active[i + 1]) for i in range(0, len(active) - 1, 2)])
+        active = [active[i + 1] for i in range(0, len(active) - 1, 2)] + active[len(active) - len(active) % 2:]
+    return layers, active[0]
+
+
+def append_parity(circuit, qubits, target, synthesis="chain"):
+    # XORs the parity of qubits into target.
+    # "chain" puts every CX on target, O(k) deep; "tree" folds the qubits pairwise in O(log k) layers,
+    # copies the root onto target and unfolds again, for 2(k - 1) + 1 CX gates
+    qubits = list(qubits)
+    # Each layer is one broadcast cx call rather than one call per gate
+    if synthesis == "chain" or len(qubits) < 3:
+        if qubits:
+            circuit.cx(qubits, target)
+        return circuit
+    if synthesis != "tree":
+        raise ValueError(f"Unknown oracle synthesis {synthesis!r}")
+    layers, root = parity_tree_layers(qubits)
+    for layer in layers:
+        circuit.cx(*zip(*layer))
+    circuit.cx(root, target)
+    for layer in reversed(layers):
+        circuit.cx(*zip(*layer))
+    return circuit
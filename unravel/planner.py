@@ -0,0 +1,154 @@
+# ########## Simulation Method Planner ##########
+import os
+from functools import lru_cache
+
+from unravel.stabilizer import is_clifford
+
+
+# Aer methods the planner can choose from
+STABILIZER, MPS, STATEVECTOR, DENSITY_MATRIX = "stabilizer", "matrix_product_state", "statevector", "density_matrix"
+
+# Memory a single run may use, per session; set UNRAVEL_SESSION_MEMORY_MB to change it
+SESSION_MEMORY_BUDGET = int(os.environ.get("UNRAVEL_SESSION_MEMORY_MB", 2048)) * 2**20
+
+# Rough single-core costs, used only to rank methods and to give the user an order of magnitude
+SECONDS_PER_AMPLITUDE_UPDATE = 2e-9
+SECONDS_PER_TABLEAU_ROW_UPDATE = 5e-9
+
+COMPLEX_BYTES = 16
+TWO_QUBIT_GATES = frozenset({"cx", "cy", "cz", "swap", "ch", "crx", "cry", "crz", "cp", "cu", "ecr", "rzz", "rxx"})
+
+
+class MemoryBudgetError(RuntimeError):
+    pass
+
+
+class SimulationPlan:
+    def __init__(self, method, memory_bytes, runtime_s, reason, downgraded=False):
+        self.method = method
+        self.memory_bytes = memory_bytes
+        self.runtime_s = runtime_s
+        self.reason = reason
+        self.downgraded = downgraded
+
+    def describe(self):
+        return (
+            f"{self.method} (about {format_bytes(self.memory_bytes)}, ~{self.runtime_s:.2g}s): {self.reason}"
+        )
+
+
+def format_bytes(size):
+    for unit in ["B", "KiB", "MiB", "GiB", "TiB"]:
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size * 1024:.3g} TiB"
+
+
+def max_bond_dimension(circuit):
+    # Upper bound on the MPS bond dimension: every two-qubit gate across a cut can at most double
+    # the Schmidt rank there, and no cut can exceed 2^min(left, right) qubits
+    n = circuit.num_qubits
+    crossings = [0] * max(n - 1, 0)
+    for instruction in circuit.data:
+        if instruction.operation.name not in TWO_QUBIT_GATES:
+            continue
+        a, b = sorted(circuit.find_bit(qubit).index for qubit in instruction.qubits)
+        for cut in range(a, b):
+            crossings[cut] += 1
+    return max([2 ** min(count, cut + 1, n - cut - 1) for cut, count in enumerate(crossings)], default=1)
+
+
+def active_qubits(circuit):
+    # Qubits some operation acts on. Aer drops idle qubits before simulating, so a circuit routed onto a
+    # 127-qubit device costs what the qubits it was actually laid out on cost
+    used = set()
+    for instruction in circuit.data:
+        if instruction.operation.name != "barrier":
+            used.update(instruction.qubits)
+    return max(len(used), 1)
+
+
+def estimate(method, circuit, shots=1024, noisy=False):
+    # (memory in bytes, runtime in seconds) for one run of the circuit with the given method.
+    # With noise, statevector and MPS sample one trajectory per shot, so their gate cost is paid per shot
+    n = active_qubits(circuit)
+    gates = max(circuit.size(), 1) * (shots if noisy and method in (STATEVECTOR, MPS) else 1)
+    if method == STABILIZER:
+        memory = (2 * n) * (2 * n + 1) // 8 + 1
+        return memory, gates * 2 * n * SECONDS_PER_TABLEAU_ROW_UPDATE + shots * n * SECONDS_PER_AMPLITUDE_UPDATE
+    if method == MPS:
+        bond = max_bond_dimension(circuit)
+        memory = n * 2 * bond**2 * COMPLEX_BYTES
+        return memory, gates * bond**3 * SECONDS_PER_AMPLITUDE_UPDATE + shots * n * bond**2 * SECONDS_PER_AMPLITUDE_UPDATE
+    if method == STATEVECTOR:
+        return 2**n * COMPLEX_BYTES, gates * 2**n * SECONDS_PER_AMPLITUDE_UPDATE
+    if method == DENSITY_MATRIX:
+        return 4**n * COMPLEX_BYTES, gates * 4**n * SECONDS_PER_AMPLITUDE_UPDATE
+    raise ValueError(f"Unknown simulation method: {method}")
+
+
+# Widest circuit each AerSimulator method accepts: 63 qubits for MPS, what the host's memory holds for the
+# dense methods. Aer is only imported once a noiseless circuit is actually planned
+@lru_cache(maxsize=None)
+def method_qubit_limit(method):
+    from qiskit_aer import AerSimulator
+
+    return AerSimulator(method=method).num_qubits
+
+
+def candidate_methods(circuit, noisy=False):
+    # Methods able to simulate the circuit exactly, with the reason each one would be picked
+    candidates = []
+    if is_clifford(circuit) and not noisy:
+        candidates.append((STABILIZER, "Clifford-only circuit, so a stabilizer tableau is exact and polynomial"))
+    if noisy:
+        candidates.append((DENSITY_MATRIX, "noise is applied exactly to the full density matrix"))
+        candidates.append((STATEVECTOR, "noise is sampled per shot with statevector trajectories"))
+    else:
+        candidates.append((STATEVECTOR, "few enough qubits that a dense statevector is the cheapest exact method"))
+    candidates.append((MPS, "low entanglement across qubit cuts keeps the matrix product state small"))
+    return candidates
+
+
+def plan_simulation(circuits, shots=1024, budget_bytes=SESSION_MEMORY_BUDGET, noisy=False):
+    # Picks the cheapest method that fits the memory budget for every circuit of a batch.
+    # The first candidate is the preferred one; anything else is reported as a downgrade.
+    # Noisy circuits run on their device's simulator, so only noiseless runs are held to AerSimulator's widths
+    if not isinstance(circuits, (list, tuple)):
+        circuits = [circuits]
+    candidates = None
+    for circuit in circuits:
+        methods = candidate_methods(circuit, noisy)
+        candidates = methods if candidates is None else [c for c in candidates if c[0] in dict(methods)]
+
+    width = max(circuit.num_qubits for circuit in circuits)
+
+    def too_wide(method):
+        return not noisy and width > method_qubit_limit(method)
+
+    estimates = []
+    for method, reason in candidates:
+        costs = [estimate(method, circuit, shots, noisy) for circuit in circuits]
+        memory = max(cost[0] for cost in costs)
+        runtime = sum(cost[1] for cost in costs)
+        estimates.append((method, reason, memory, runtime))
+
+    fitting = [entry for entry in estimates if entry[2] <= budget_bytes and not too_wide(entry[0])]
+    if not fitting:
+        accepted = [entry for entry in estimates if not too_wide(entry[0])]
+        if not accepted:
+            raise MemoryBudgetError(f"No Aer simulation method accepts this {width}-qubit circuit. Try fewer qubits.")
+        smallest = min(accepted, key=lambda entry: entry[2])
+        raise MemoryBudgetError(
+            f"The cheapest method ({smallest[0]}) needs about {format_bytes(smallest[2])}, "
+            f"over this session's {format_bytes(budget_bytes)} budget. Try fewer qubits."
+        )
+    method, reason, memory, runtime = min(fitting, key=lambda entry: entry[3])
+    preferred = estimates[0]
+    downgraded = method != preferred[0] and preferred not in fitting
+    if downgraded and preferred[2] > budget_bytes:
+        reason += f"; {preferred[0]} would need {format_bytes(preferred[2])}, over the budget"
+    elif downgraded:
+        reason += f"; {preferred[0]} accepts at most {method_qubit_limit(preferred[0])} qubits"
+    return SimulationPlan(method, memory, runtime, reason, downgraded)
@@ -0,0 +1,75 @@
+# ########## Stage Timing and Profiling ##########
+import cProfile
+import io
+import json
+import logging
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+
+# Every finished stage is logged here as one JSON object, for whatever collects the server logs
+logger = logging.getLogger("unravel.timing")
+
+
+# Wall time, CPU time of the running thread and (optionally) peak Python memory of named stages.
+# tracemalloc is process-wide, so peaks are approximate while several sessions run at once.
+class StageTimer:
+    def __init__(self, profile=False, trace_memory=False, labels=None):
+        self.labels = labels or {}
+        self.records = []
+        self.trace_memory = trace_memory
+        self.profiler = cProfile.Profile() if profile else None
+        self._reported = 0
+        self._depth = 0
+
+    @contextmanager
+    def stage(self, name):
+        # Stages may nest (a result store lookup inside a stabilizer run): only the outermost one starts
+        # tracing, resets the peak and switches the profiler, so inner stages never cut the outer one short
+        outermost = self._depth == 0
+        self._depth += 1
+        started_tracing = False
+        if self.trace_memory and outermost:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracing = True
+            elif hasattr(tracemalloc, "reset_peak"):  # Python 3.9+; a fresh trace starts at zero anyway
+                tracemalloc.reset_peak()
+        if self.profiler is not None and outermost:
+            self.profiler.enable()
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield
+        finally:
+            wall, cpu = time.perf_counter() - wall, time.thread_time() - cpu
+            self._depth -= 1
+            if self.profiler is not None and outermost:
+                self.profiler.disable()
+            peak = None
+            if self.trace_memory:
+                # An inner stage reports the peak of its outer stage so far
+                peak = tracemalloc.get_traced_memory()[1]
+                if started_tracing:
+                    tracemalloc.stop()
+            record = {"stage": name, "wall_s": wall, "cpu_s": cpu, "peak_bytes": peak, "timestamp": time.time(), **self.labels}
+            self.records.append(record)
+            logger.info(json.dumps(record))
+
+    def drain(self):
+        # Records finished since the last drain, so each one is reported exactly once
+        records = self.records[self._reported:]
+        self._reported = len(self.records)
+        return records
+
+    def profile_report(self, limit=30):
+        if self.profiler is None or not self.records:
+            return ""
+        stream = io.StringIO()
+        pstats.Stats(self.profiler, stream=stream).sort_stats("cumulative").print_stats(limit)
+        return stream.getvalue()
+
+
+def timed_stage(timer, name):
+    return nullcontext() if timer is None else timer.stage(name)
@@ -0,0 +1,108 @@
+# ########## Shot Analytics ##########
+import os
+
+import numpy as np
+
+from unravel.analytic import analytic_distribution, sample_memory
+from unravel.counts import counts_to_arrays, outcome_dtype
+from unravel.oracles import expected_outcome, oracle_mask
+
+
+# Shots simulated per backend job when per-shot memory is requested
+MEMORY_CHUNK_SHOTS = int(os.environ.get("UNRAVEL_MEMORY_CHUNK_SHOTS", 2**18))
+# Runs up to this many shots keep every packed outcome; larger runs keep only the running statistics
+MEMORY_KEEP_SHOTS = int(os.environ.get("UNRAVEL_MEMORY_KEEP_SHOTS", 2**22))
+
+
+# Running totals over packed outcomes (qubit 0 in bit 0). Memory is O(n + distinct outcomes) however
+# many shots are added, and every statistic is a few array operations per measured bit
+class ShotStats:
+    def __init__(self, algorithm, n, spec):
+        self.algorithm = algorithm
+        self.n = n
+        self.spec = spec
+        # DJ and BV both have one noiseless outcome: all zeros, the balanced CX mask or the secret s
+        self.expected = expected_outcome(oracle_mask(n, spec))
+        self.shots = 0
+        self.successes = 0
+        self.ones = np.zeros(n, dtype=np.int64)
+        self.hamming = np.zeros(n + 1, dtype=np.int64)
+        self._counts = {}
+
+    @classmethod
+    def from_counts(cls, algorithm, n, spec, counts):
+        stats = cls(algorithm, n, spec)
+        stats.update(*counts_to_arrays(counts))
+        return stats
+
+    def update(self, outcomes, weights=None):
+        # outcomes are packed shots; weights turns them into distinct outcomes with frequencies
+        dtype = outcome_dtype(self.n)
+        outcomes = np.asarray(outcomes).astype(dtype, copy=False)
+        weights = np.ones(len(outcomes), dtype=np.int64) if weights is None else np.asarray(weights, dtype=np.int64)
+        if self.algorithm == "dj" and self.spec[0] != "constant":
+            # A balanced function is recognised by any outcome other than all zeros
+            self.successes += int(weights[outcomes != 0].sum())
+        else:
+            self.successes += int(weights[outcomes == self.expected].sum())
+
+        difference = outcomes ^ dtype(self.expected)
+        distance = np.zeros(len(outcomes), dtype=np.uint8)
+        for qubit in range(self.n):
+            bit = ((outcomes >> dtype(qubit)) & dtype(1)).astype(bool)
+            self.ones[qubit] += int(weights[bit].sum())
+            distance += ((difference >> dtype(qubit)) & dtype(1)).astype(np.uint8)
+        self.hamming += np.bincount(distance, weights=weights, minlength=self.n + 1).astype(np.int64)
+
+        values, inverse = np.unique(outcomes, return_inverse=True)
+        for value, count in zip(values.tolist(), np.bincount(inverse, weights=weights).tolist()):
+            self._counts[value] = self._counts.get(value, 0) + int(count)
+        self.shots += int(weights.sum())
+
+    def counts(self):
+        return {format(value, f"0{self.n}b"): count for value, count in sorted(self._counts.items())}
+
+    def success_rate(self):
+        return self.successes / self.shots if self.shots else 0.0
+
+    def marginals(self):
+        # P(qubit q measured 1), indexed by qubit
+        return self.ones / max(self.shots, 1)
+
+    def hamming_distribution(self):
+        # Share of shots at each Hamming distance 0..n from the expected outcome
+        return self.hamming / max(self.shots, 1)
+
+    def mean_hamming(self):
+        return float(np.arange(self.n + 1) @ self.hamming_distribution())
+
+    def summary(self):
+        return {
+            "shots": self.shots,
+            "expected": format(self.expected, f"0{self.n}b"),
+            "success_rate": self.success_rate(),
+            "mean_hamming": self.mean_hamming(),
+            "hamming": self.hamming.tolist(),
+            "marginals": self.marginals().tolist(),
+        }
+
+
+# What a per-shot run returns: its statistics and, when small enough to keep, every packed outcome in shot order
+class ShotRecord:
+    def __init__(self, stats, memory=None):
+        self.stats = stats
+        self.memory = memory
+
+    @classmethod
+    def from_memory(cls, algorithm, n, spec, memory, keep_shots=MEMORY_KEEP_SHOTS):
+        stats = ShotStats(algorithm, n, spec)
+        stats.update(memory)
+        return cls(stats, memory if len(memory) <= keep_shots else None)
+
+    def counts(self):
+        return self.stats.counts()
+
+
+def sample_shot_record(algorithm, n, spec, shots=1024, seed=None):
+    # Per-shot memory from the analytic sampler, with no circuit to simulate
+    return ShotRecord.from_memory(algorithm, n, spec, sample_memory(analytic_distribution(n, spec), shots, seed))
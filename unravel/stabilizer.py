@@ -0,0 +1,99 @@
+# ########## Clifford / Stabilizer Engine ##########
+from functools import lru_cache
+
+import numpy as np
+from qiskit.quantum_info import Clifford
+
+from unravel.counts import memory_to_array, pack_bits
+
+
+# Instructions a stabilizer tableau can simulate exactly
+CLIFFORD_INSTRUCTIONS = frozenset(
+    {"id", "x", "y", "z", "h", "s", "sdg", "sx", "sxdg", "cx", "cy", "cz", "swap", "barrier", "measure"}
+)
+
+# Largest register each engine is offered for on the algorithm pages
+# ("Auto" is further limited by the planner's memory budget)
+ENGINE_QUBIT_LIMITS = {"Statevector": 10, "Stabilizer": 500, "Auto": 500}
+
+
+# Aer is only imported the first time a circuit is actually sent to the stabilizer engine
+@lru_cache(maxsize=None)
+def get_stabilizer_backend():
+    from qiskit_aer import AerSimulator
+
+    return AerSimulator(method="stabilizer")
+
+
+def is_clifford(circuit):
+    return all(instruction.operation.name in CLIFFORD_INSTRUCTIONS for instruction in circuit.data)
+
+
+def final_measurements(circuit):
+    # Map measured qubits to their clbits, or None if any qubit is used again after being measured
+    measured = {}
+    for instruction in circuit.data:
+        qubits = [circuit.find_bit(qubit).index for qubit in instruction.qubits]
+        if instruction.operation.name == "measure":
+            measured[qubits[0]] = circuit.find_bit(instruction.clbits[0]).index
+        elif instruction.operation.name != "barrier" and any(qubit in measured for qubit in qubits):
+            return None
+    return measured
+
+
+def row_basis(matrix):
+    # Gaussian elimination over GF(2), keeping only the independent rows
+    matrix = matrix.copy()
+    rank = 0
+    for column in range(matrix.shape[1]):
+        pivots = np.flatnonzero(matrix[rank:, column])
+        if pivots.size == 0:
+            continue
+        pivot = rank + pivots[0]
+        matrix[[rank, pivot]] = matrix[[pivot, rank]]
+        rows = np.flatnonzero(matrix[:, column])
+        matrix[rows[rows != rank]] ^= matrix[rank]
+        rank += 1
+        if rank == matrix.shape[0]:
+            break
+    return matrix[:rank]
+
+
+def run_stabilizer(circuit, shots=1024, seed=None, memory=False):
+    # Counts, or with memory=True every shot as a packed outcome (clbit 0 in bit 0)
+    if not is_clifford(circuit):
+        raise ValueError("The stabilizer engine can only simulate Clifford circuits")
+
+    options = {} if seed is None else {"seed_simulator": seed}
+    measured = final_measurements(circuit)
+    if measured is None:
+        # Mid-circuit measurements: let Aer's tableau simulate every shot
+        result = get_stabilizer_backend().run(circuit, shots=shots, memory=memory, **options).result()
+        return memory_to_array(result.get_memory()) if memory else result.get_counts()
+
+    # A single tableau shot gives one outcome the state can produce
+    reference = get_stabilizer_backend().run(circuit, shots=1, **options).result().get_counts()
+    reference = next(iter(reference)).replace(" ", "")
+
+    # Outcomes of a stabilizer state are uniform over reference + span(X parts of its generators),
+    # so every other shot can be sampled from that affine subspace without touching the tableau again
+    unitary = circuit.remove_final_measurements(inplace=False)
+    stab_x = Clifford(unitary).stab_x
+    directions = np.zeros((stab_x.shape[0], circuit.num_clbits), dtype=np.uint8)
+    for qubit, clbit in measured.items():
+        directions[:, clbit] = stab_x[:, qubit]
+    basis = row_basis(directions)
+    if basis.shape[0] == 0:
+        if memory:
+            return np.repeat(memory_to_array([reference]), shots)
+        return {reference: shots}
+
+    rng = np.random.default_rng(seed)
+    reference_bits = np.array([int(bit) for bit in reversed(reference)], dtype=np.uint8)
+    coefficients = rng.integers(0, 2, size=(shots, basis.shape[0]), dtype=np.uint8)
+    # uint8 overflow wraps modulo 256, which keeps the parity we need
+    outcomes = ((coefficients @ basis) & 1) ^ reference_bits
+    if memory:
+        return pack_bits(outcomes)
+    rows, frequencies = np.unique(outcomes, axis=0, return_counts=True)
+    return {"".join(map(str, row[::-1])): int(count) for row, count in zip(rows, frequencies)}
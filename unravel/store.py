@@ -0,0 +1,139 @@
+# ########## Persistent Result Store ##########
+import csv
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from threading import Lock
+
+from unravel.cache import circuit_hash
+
+
+# Results survive restarts and are shared by every session; set UNRAVEL_RESULT_STORE to move the file
+RESULT_STORE_PATH = os.environ.get(
+    "UNRAVEL_RESULT_STORE", os.path.join(os.path.expanduser("~"), ".cache", "unravel", "results.sqlite")
+)
+RESULT_STORE_MAX_BYTES = int(os.environ.get("UNRAVEL_RESULT_STORE_MB", 256)) * 2**20
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    fingerprint TEXT PRIMARY KEY,
+    backend TEXT NOT NULL,
+    shots INTEGER NOT NULL,
+    options TEXT NOT NULL,
+    counts TEXT NOT NULL,
+    metadata TEXT NOT NULL,
+    run_s REAL NOT NULL,
+    created REAL NOT NULL,
+    last_used REAL NOT NULL,
+    size INTEGER NOT NULL
+)
+"""
+COLUMNS = ["fingerprint", "backend", "shots", "options", "counts", "metadata", "run_s", "created", "last_used", "size"]
+
+
+def run_fingerprint(circuit, backend_name, shots, options=None):
+    # Canonical hash of what actually runs: the transpiled circuit plus everything passed to backend.run
+    options = json.dumps(options or {}, sort_keys=True, default=str)
+    payload = "\n".join([circuit_hash(circuit), backend_name, str(shots), options])
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ResultStore:
+    def __init__(self, path=RESULT_STORE_PATH, max_bytes=RESULT_STORE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        # A short-lived connection per call, so job threads and the CLI never share one
+        connection = sqlite3.connect(self.path, timeout=30)
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def get(self, fingerprint):
+        with self._lock, self._connect() as connection:
+            row = connection.execute("SELECT counts FROM results WHERE fingerprint = ?", (fingerprint,)).fetchone()
+            if row is None:
+                return None
+            connection.execute("UPDATE results SET last_used = ? WHERE fingerprint = ?", (time.time(), fingerprint))
+        return json.loads(row[0])
+
+    def put(self, fingerprint, backend_name, shots, options, counts, metadata=None, run_s=0.0):
+        options = json.dumps(options or {}, sort_keys=True, default=str)
+        counts = json.dumps(counts, sort_keys=True)
+        metadata = json.dumps(metadata or {}, sort_keys=True, default=str)
+        size = len(fingerprint) + len(backend_name) + len(options) + len(counts) + len(metadata)
+        now = time.time()
+        with self._lock, self._connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (fingerprint, backend_name, shots, options, counts, metadata, run_s, now, now, size),
+            )
+            self._evict(connection)
+
+    def _evict(self, connection):
+        # Least recently used rows go first, down to 90% of the budget so eviction does not run on every put
+        total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        target = self.max_bytes * 0.9
+        for fingerprint, size in connection.execute("SELECT fingerprint, size FROM results ORDER BY last_used").fetchall():
+            if total <= target:
+                break
+            connection.execute("DELETE FROM results WHERE fingerprint = ?", (fingerprint,))
+            total -= size
+
+    def stats(self):
+        with self._lock, self._connect() as connection:
+            rows, size = connection.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results").fetchone()
+        return {"path": self.path, "rows": rows, "bytes": size, "max_bytes": self.max_bytes}
+
+    def rows(self):
+        # Every stored run as a dict with counts, options and metadata decoded, for offline analysis
+        with self._lock, self._connect() as connection:
+            rows = connection.execute(f"SELECT {', '.join(COLUMNS)} FROM results ORDER BY created").fetchall()
+        records = []
+        for row in rows:
+            record = dict(zip(COLUMNS, row))
+            for column in ["options", "counts", "metadata"]:
+                record[column] = json.loads(record[column])
+            records.append(record)
+        return records
+
+    def export_csv(self, path):
+        rows = self.rows()
+        with open(path, "w", newline="") as handle:
+            writer = csv.DictWriter(handle, fieldnames=COLUMNS)
+            writer.writeheader()
+            for row in rows:
+                writer.writerow({key: json.dumps(value) if isinstance(value, dict) else value for key, value in row.items()})
+        return len(rows)
+
+    def clear(self):
+        with self._lock, self._connect() as connection:
+            connection.execute("DELETE FROM results")
+
+
+_default_store = None
+_default_store_lock = Lock()
+
+
+def get_result_store():
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = ResultStore()
+        return _default_store
@@ -0,0 +1,86 @@
+# ########## Streaming Shot Execution ##########
+import math
+from threading import Lock
+
+from unravel.algorithms import success_probability
+from unravel.execution import RunCircuit
+
+
+CONFIDENCE_Z = 1.96  # 95% two-sided
+
+
+def wilson_interval(successes, trials, z=CONFIDENCE_Z):
+    # Stays inside [0, 1] and behaves at p = 0 or 1, where the normal approximation collapses to a point
+    if trials == 0:
+        return 0.0, 1.0
+    p = successes / trials
+    denominator = 1 + z**2 / trials
+    centre = (p + z**2 / (2 * trials)) / denominator
+    margin = z * math.sqrt(p * (1 - p) / trials + z**2 / (4 * trials**2)) / denominator
+    return max(0.0, centre - margin), min(1.0, centre + margin)
+
+
+def split_shots(shots, chunks):
+    chunks = max(1, min(chunks, shots))
+    size, extra = divmod(shots, chunks)
+    return [size + (index < extra) for index in range(chunks)]
+
+
+# Counts merged chunk by chunk; the job thread writes, the page reads a snapshot on every rerun
+class StreamingCounts:
+    def __init__(self, algorithm, n, spec, shots):
+        self.algorithm = algorithm
+        self.n = n
+        self.spec = spec
+        self.shots = shots
+        self.shots_done = 0
+        self.stopped_early = False
+        self._counts = {}
+        self._lock = Lock()
+
+    def merge(self, counts):
+        with self._lock:
+            for outcome, count in counts.items():
+                self._counts[outcome] = self._counts.get(outcome, 0) + count
+            self.shots_done += sum(counts.values())
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._counts)
+
+    def success(self):
+        # (estimate, low, high) of the success probability over the shots merged so far
+        counts = self.snapshot()
+        if not counts:
+            return 0.0, 0.0, 1.0
+        trials = sum(counts.values())
+        p = success_probability(self.algorithm, self.n, self.spec, counts)
+        return (p, *wilson_interval(round(p * trials), trials))
+
+    def settled(self):
+        # The most frequent outcome is settled once its interval lies above every other outcome's
+        counts = sorted(self.snapshot().values(), reverse=True)
+        if not counts:
+            return False
+        trials = sum(counts)
+        leader_low = wilson_interval(counts[0], trials)[0]
+        runner_up_high = wilson_interval(counts[1] if len(counts) > 1 else 0, trials)[1]
+        return leader_low > runner_up_high
+
+
+def RunStreaming(
+    circuit, provider, backend_name, stream, chunks=16, engine="Statevector", cache_key=None, options=None,
+    early_stop=True, min_shots=64, transpile_options=None, noise=None,
+):
+    # Runs stream.shots in chunks, merging each into the stream as it lands, and stops once settled
+    for chunk_shots in split_shots(stream.shots, chunks):
+        stream.merge(
+            RunCircuit(
+                circuit, provider, backend_name, chunk_shots, engine, cache_key, options=options,
+                transpile_options=transpile_options, noise=noise,
+            )
+        )
+        if early_stop and stream.shots_done >= min_shots and stream.shots_done < stream.shots and stream.settled():
+            stream.stopped_early = True
+            break
+    return stream.snapshot()
@@ -0,0 +1,116 @@
+# ########## Parameter Sweep ##########
+import itertools
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from qiskit import transpile
+from qiskit.providers.basic_provider import BasicProvider
+
+from unravel.algorithms import ORACLE_KINDS, build_circuit, oracle_spec, success_probability
+from unravel.counts import MEMORY_MAX_BITS
+from unravel.execution import default_aer_options, get_aer_backend
+from unravel.noise import get_noisy_backend, route_to_device
+from unravel.planner import STABILIZER, plan_simulation
+from unravel.shots import ShotStats
+from unravel.stabilizer import run_stabilizer
+
+
+def sweep_tasks(algorithms, n_values, seeds, oracles=None):
+    tasks = []
+    for algorithm in algorithms:
+        kinds = [oracle for oracle in ORACLE_KINDS[algorithm] if oracles is None or oracle in oracles]
+        for n, oracle, seed in itertools.product(n_values, kinds, seeds):
+            tasks.append((algorithm, n, oracle, seed))
+    return tasks
+
+
+def run_sweep_task(task, shots=1024, engine="Statevector"):
+    algorithm, n, oracle, seed = task
+    spec = oracle_spec(algorithm, oracle, n, seed)
+
+    start = time.perf_counter()
+    circuit = build_circuit(algorithm, n, spec)
+    build_s = time.perf_counter() - start
+
+    method = plan_simulation(circuit, shots).method if engine == "Auto" else None
+    if engine == "Stabilizer" or method == STABILIZER:
+        transpile_s = 0.0
+        start = time.perf_counter()
+        counts = run_stabilizer(circuit, shots=shots, seed=seed)
+        simulate_s = time.perf_counter() - start
+    else:
+        backend = BasicProvider().get_backend("basic_simulator") if method is None else get_aer_backend(method)
+        start = time.perf_counter()
+        transpiled_circuit = transpile(circuit, backend=backend)
+        transpile_s = time.perf_counter() - start
+        start = time.perf_counter()
+        counts = backend.run(transpiled_circuit, shots=shots, seed_simulator=seed).result().get_counts()
+        simulate_s = time.perf_counter() - start
+
+    return sweep_row(task, spec, circuit, engine, method or engine.lower(), shots, build_s, transpile_s, simulate_s, counts)
+
+
+def sweep_row(task, spec, circuit, engine, method, shots, build_s, transpile_s, simulate_s, counts):
+    algorithm, n, oracle, seed = task
+    gate_counts = circuit.count_ops()
+    return {
+        "algorithm": algorithm,
+        "n": n,
+        "oracle": oracle,
+        "seed": seed,
+        "engine": engine,
+        "method": method,
+        "shots": shots,
+        "build_s": build_s,
+        "transpile_s": transpile_s,
+        "simulate_s": simulate_s,
+        "depth": circuit.depth(),
+        "size": circuit.size(),
+        "cx_count": gate_counts.get("cx", 0),
+        "gate_counts": " ".join(f"{name}:{count}" for name, count in sorted(gate_counts.items())),
+        "success_probability": success_probability(algorithm, n, spec, counts),
+        # Average number of bits off the noiseless answer; shows how noise degrades a run, not just whether it failed
+        "mean_hamming": ShotStats.from_counts(algorithm, n, spec, counts).mean_hamming() if n <= MEMORY_MAX_BITS else None,
+    }
+
+
+def run_noisy_sweep(tasks, device, shots=1024):
+    # Every task with the device's noise model in one Aer job per simulation method, not one job per task.
+    # Aer spreads the circuits and their shots over its threads; transpile and simulate times are
+    # per-task shares of the batch
+    specs, circuits, build_times = [], [], []
+    for algorithm, n, oracle, seed in tasks:
+        start = time.perf_counter()
+        specs.append(oracle_spec(algorithm, oracle, n, seed))
+        circuits.append(build_circuit(algorithm, n, specs[-1]))
+        build_times.append(time.perf_counter() - start)
+
+    # Methods are planned on the routed circuits, which may use more of the device than n + 1 qubits
+    start = time.perf_counter()
+    routed = route_to_device(circuits, device)
+    transpile_s = (time.perf_counter() - start) / len(tasks)
+    methods = [plan_simulation(circuit, shots, noisy=True).method for circuit in routed]
+    rows = [None] * len(tasks)
+    for method in dict.fromkeys(methods):
+        indices = [index for index, planned in enumerate(methods) if planned == method]
+        backend = get_noisy_backend(device, method)
+        start = time.perf_counter()
+        result = backend.run([routed[index] for index in indices], shots=shots, **default_aer_options()).result()
+        simulate_s = (time.perf_counter() - start) / len(indices)
+        for position, index in enumerate(indices):
+            rows[index] = sweep_row(
+                tasks[index], specs[index], circuits[index], f"noisy:{device}", method, shots, build_times[index],
+                transpile_s, simulate_s, result.get_counts(position),
+            )
+    return rows
+
+
+def run_sweep(tasks, shots=1024, engine="Statevector", max_workers=None):
+    # Yields one result row per task as soon as its worker finishes.
+    # Workers are spawned rather than forked so they never inherit the server's threads.
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as executor:
+        futures = [executor.submit(run_sweep_task, task, shots, engine) for task in tasks]
+        for future in as_completed(futures):
+            yield future.result()
@@ -0,0 +1,72 @@
+# ########## Circuit Templates ##########
+from functools import lru_cache
+from math import pi
+
+from qiskit import QuantumCircuit
+
+from unravel.oracles import mask_qubits
+from unravel.parity import append_parity
+
+
+# DJ and BV share one query circuit: H on the inputs (and |-> on an ancilla), the oracle, H again, measure.
+# The fixed parts are built once per register size and composed in place around each oracle
+@lru_cache(maxsize=None)
+def query_prefix(num_qubits, n):
+    prefix = QuantumCircuit(num_qubits, n)
+    prefix.h(range(n))
+    # Ancilla oracles kick their phase back through an ancilla in |->
+    if num_qubits > n:
+        prefix.x(n)
+        prefix.h(n)
+    prefix.barrier()
+    return prefix
+
+
+@lru_cache(maxsize=None)
+def query_suffix(num_qubits, n, final_barrier=True):
+    suffix = QuantumCircuit(num_qubits, n)
+    suffix.barrier()
+    suffix.h(range(n))
+    if final_barrier:
+        suffix.barrier()
+    suffix.measure(range(n), range(n))
+    return suffix
+
+
+def assemble_query(n, oracle, final_barrier=True):
+    # oracle is a circuit or a boxed gate on n (phase) or n + 1 (ancilla) qubits
+    circuit = QuantumCircuit(oracle.num_qubits, n)
+    circuit.compose(query_prefix(oracle.num_qubits, n), inplace=True)
+    circuit.compose(oracle, inplace=True)
+    circuit.compose(query_suffix(oracle.num_qubits, n, final_barrier), inplace=True)
+    return circuit
+
+
+def mask_oracle(n, mask, phase_oracle=False, synthesis="chain"):
+    # An OracleMask as gates: the ancilla oracle XORs f(x) into qubit n,
+    # the phase oracle applies (-1)^f(x) to the n inputs directly
+    oracle = QuantumCircuit(n if phase_oracle else n + 1)
+    if mask.kind == "constant":
+        if mask.output == 1:
+            # (-1)^1 on every input is only a global phase; on the ancilla it is a single X
+            if phase_oracle:
+                oracle.global_phase = pi
+            else:
+                oracle.x(n)
+        return oracle
+
+    flipped = mask_qubits(mask.x_mask)
+    parity = mask_qubits(mask.parity_mask)
+    if mask.kind == "bv":
+        parity.reverse()  # gates follow s, which is read most significant bit first
+    # X-gates before and after the parity select which inputs it is computed on
+    if flipped:
+        oracle.x(flipped)
+    if phase_oracle and parity:
+        # A Z wherever the ancilla oracle places a CX: the phase kickback applied directly
+        oracle.z(parity)
+    elif not phase_oracle:
+        append_parity(oracle, parity, n, synthesis)
+    if flipped:
+        oracle.x(flipped)
+    return oracle
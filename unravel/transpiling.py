@@ -0,0 +1,86 @@
+# ########## Transpiler Options ##########
+import time
+
+from qiskit import transpile
+from qiskit.transpiler import CouplingMap
+
+
+OPTIMIZATION_LEVELS = [0, 1, 2, 3]
+COUPLING_PRESETS = ["all-to-all", "line", "ring", "grid", "heavy-hex"]
+DEFAULT_TRANSPILE_OPTIONS = {"optimization_level": 1, "coupling": "all-to-all"}
+
+# Layout and routing are stochastic; a fixed seed keeps transpiled circuits, and so stored results, reproducible
+TRANSPILE_SEED = 0
+
+
+def connected_subset(coupling, num_qubits):
+    # The first num_qubits physical qubits reached by a breadth-first walk, so the reduced map stays connected
+    neighbours = {}
+    for a, b in coupling.get_edges():
+        neighbours.setdefault(a, set()).add(b)
+        neighbours.setdefault(b, set()).add(a)
+    order, frontier = [0], [0]
+    while frontier and len(order) < num_qubits:
+        for qubit in sorted(neighbours[frontier.pop(0)]):
+            if qubit not in order:
+                order.append(qubit)
+                frontier.append(qubit)
+    return sorted(order[:num_qubits])
+
+
+def coupling_map(preset, num_qubits):
+    # A device-like connectivity with exactly num_qubits physical qubits; None means all-to-all
+    if preset == "all-to-all" or num_qubits < 2:
+        return None
+    if preset == "line":
+        return CouplingMap.from_line(num_qubits)
+    if preset == "ring":
+        return CouplingMap.from_ring(num_qubits) if num_qubits > 2 else CouplingMap.from_line(num_qubits)
+    if preset == "grid":
+        rows = int(num_qubits**0.5)
+        coupling = CouplingMap.from_grid(rows, -(-num_qubits // rows))
+    elif preset == "heavy-hex":
+        distance = 3
+        while (5 * distance**2 - 2 * distance - 1) // 2 < num_qubits:
+            distance += 2
+        coupling = CouplingMap.from_heavy_hex(distance)
+    else:
+        raise ValueError(f"Unknown coupling preset {preset!r}")
+    return coupling.reduce(connected_subset(coupling, num_qubits))
+
+
+def transpile_key(transpile_options):
+    # Cache key suffix; empty for the defaults so existing cache entries keep their keys
+    options = {**DEFAULT_TRANSPILE_OPTIONS, **(transpile_options or {})}
+    if options == DEFAULT_TRANSPILE_OPTIONS:
+        return ()
+    return (f"O{options['optimization_level']}", options["coupling"])
+
+
+def transpile_circuits(circuits, backend, transpile_options=None):
+    options = {**DEFAULT_TRANSPILE_OPTIONS, **(transpile_options or {})}
+    width = max(circuit.num_qubits for circuit in circuits) if isinstance(circuits, list) else circuits.num_qubits
+    return transpile(
+        circuits,
+        backend=backend,
+        optimization_level=options["optimization_level"],
+        coupling_map=coupling_map(options["coupling"], width),
+        seed_transpiler=TRANSPILE_SEED,
+    )
+
+
+def circuit_stats(circuit):
+    two_qubit = sum(1 for instruction in circuit.data if instruction.operation.num_qubits == 2)
+    return {"depth": circuit.depth(), "size": circuit.size(), "two_qubit_gates": two_qubit}
+
+
+def transpile_report(circuit, backend, transpile_options=None):
+    # Depth and gate counts before and after transpiling, with the time the transpiler took
+    start = time.perf_counter()
+    transpiled = transpile_circuits(circuit, backend, transpile_options)
+    transpile_s = time.perf_counter() - start
+    before, after = circuit_stats(circuit), circuit_stats(transpiled)
+    report = {f"{stat}_before": value for stat, value in before.items()}
+    report.update({f"{stat}_after": value for stat, value in after.items()})
+    report["transpile_s"] = transpile_s
+    return report
@@ -0,0 +1,706 @@
+# ########## Algorithm Page UI ##########
+import io
+import json
+import os
+import time
+from collections import deque
+from random import randrange
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from unravel.algorithms import EQUIVALENCE_QUBIT_LIMIT, build_circuit, oracle_style_key, phase_oracle_equivalent
+from unravel.analytic import ANALYTIC_BACKEND_NAME, run_analytic, run_analytic_batch
+from unravel.cache import DIAGRAM_FOLDS, cached_circuit, cached_diagram
+from unravel.counts import MEMORY_MAX_BITS, top_counts
+from unravel.execution import (
+    AER_PRECISIONS,
+    PROVIDERS,
+    RunCircuit,
+    RunCircuits,
+    RunShots,
+    backend_names,
+    compare_throughput,
+    default_aer_options,
+    get_provider,
+)
+from unravel.gallery import get_gallery
+from unravel.hardware import FAKE_PROVIDER_NAME, HARDWARE_PROVIDERS, SubmitToHardware, get_hardware_jobs, get_hardware_session
+from unravel.jobs import DONE, ERROR, QUEUED, QueueFullError, get_job_pool
+from unravel.noise import IDEAL, noise_devices, plan_noisy
+from unravel.parity import ORACLE_SYNTHESES
+from unravel.planner import MemoryBudgetError, plan_simulation
+from unravel.profiling import StageTimer, timed_stage
+from unravel.shots import MEMORY_KEEP_SHOTS, ShotRecord, sample_shot_record
+from unravel.stabilizer import ENGINE_QUBIT_LIMITS
+from unravel.streaming import RunStreaming, StreamingCounts
+from unravel.transpiling import (
+    COUPLING_PRESETS,
+    DEFAULT_TRANSPILE_OPTIONS,
+    OPTIMIZATION_LEVELS,
+    transpile_key,
+    transpile_report,
+)
+
+
+# The DJ and BV pages share everything below; session state is namespaced by the algorithm ("dj" or "bv")
+SEED_RANGE = 2**32
+SHOT_OPTIONS = [2**k for k in range(6, 21)]
+DIAGRAM_QUBIT_LIMIT = 64
+COLLAPSE_ORACLE_ABOVE = 6  # qubits; larger circuits are drawn with the oracle as a single box
+HISTOGRAM_TOP_K = 16  # outcomes charted individually, the rest are summed into "other"
+SHOT_PREVIEW = 100  # recorded shots listed on the page; the download has all of them
+PROFILE_HISTORY = 500  # timed stages kept per session for the profiling panel
+JOB_POLL_INTERVAL = 0.5  # seconds between reruns while a job is running
+HARDWARE_POLL_INTERVAL = 5  # seconds between provider status checks while a hardware job is pending
+ANALYTIC_PROVIDER = "Analytic"
+
+
+# What the run settings widgets chose; provider is a name from PROVIDERS or ANALYTIC_PROVIDER
+class RunSettings(NamedTuple):
+    provider: str
+    backend: str
+    engine: str = "Statevector"
+    aer_options: dict = None
+    noise: str = None
+    transpile_options: dict = None
+    shots: int = 1024
+    streaming: bool = False
+    chunks: int = 16
+    early_stop: bool = True
+    use_store: bool = False
+    record_shots: bool = False
+    runnable: bool = True
+
+
+# A set of oracles run together in one backend job: their specs, circuit keys, result labels and the job's key
+class Batch(NamedTuple):
+    specs: list
+    keys: list
+    key: tuple
+    labels: list
+
+
+def make_batch(algorithm, n, specs, labels, oracle_style):
+    keys = [(algorithm, n, spec, *oracle_style) for spec in specs]
+    return Batch(list(specs), keys, (f"{algorithm}-batch", n, tuple(specs), *oracle_style), list(labels))
+
+
+def reroll_seed(seed_key):
+    st.session_state[seed_key] = randrange(SEED_RANGE)
+
+
+def pinned_spec(spec_key, n, seed, build):
+    # Oracle specs live in the session and are only regenerated when n or the seed change
+    pinned = st.session_state.get(spec_key)
+    if pinned is None or pinned[:2] != (n, seed):
+        pinned = (n, seed, build())
+        st.session_state[spec_key] = pinned
+    return pinned[2]
+
+
+def load_or_build(circuit_key, build):
+    # Circuits in the precomputed gallery are loaded from it; anything else is built live
+    gallery = get_gallery()
+    circuit = gallery.circuit(circuit_key) if gallery is not None else None
+    return build() if circuit is None else circuit
+
+
+def keyed_circuit(circuit_key, timer=None, collapse_oracle=False):
+    # Circuit keys are (algorithm, n, spec, *oracle style); each circuit is built once per key
+    algorithm, n, spec = circuit_key[:3]
+    phase_oracle = "phase" in circuit_key[3:]
+    synthesis = "tree" if "tree" in circuit_key[3:] else "chain"
+    if collapse_oracle:
+        return cached_circuit(
+            (*circuit_key, "collapsed"), lambda: build_circuit(
+                algorithm, n, spec, collapse_oracle=True, phase_oracle=phase_oracle, synthesis=synthesis
+            )
+        )
+    return cached_circuit(
+        circuit_key,
+        lambda: load_or_build(
+            circuit_key, lambda: build_circuit(algorithm, n, spec, timer, phase_oracle=phase_oracle, synthesis=synthesis)
+        ),
+    )
+
+
+def gallery_counts(circuit_keys, backend, shots, engine, transpile_options, noise):
+    # Reference counts stand in for a live run only when every setting matches how the gallery was built
+    gallery = get_gallery()
+    if gallery is None or engine != "Statevector" or noise is not None or transpile_key(transpile_options):
+        return None
+    counts = [gallery.counts(key, backend, shots) for key in circuit_keys]
+    return None if any(answer is None for answer in counts) else counts
+
+
+def new_timer(algorithm):
+    # None unless profiling is switched on in the sidebar, so unprofiled runs pay nothing
+    if not st.session_state.get("profile_page"):
+        return None
+    return StageTimer(profile=st.session_state.get("profile_cprofile", False), trace_memory=True, labels={"page": algorithm})
+
+
+def profiling_sidebar(algorithm):
+    st.sidebar.toggle("Profile this page", key="profile_page")
+    st.sidebar.checkbox("Capture cProfile stats", key="profile_cprofile", disabled=not st.session_state.get("profile_page"))
+    return new_timer(algorithm)
+
+
+def oracle_style_form(engine):
+    # Without the |-> ancilla the statevector holds one more input qubit in the same memory
+    phase_oracle = st.checkbox("Use an ancilla-free phase oracle (one qubit fewer to simulate)")
+    max_n = ENGINE_QUBIT_LIMITS[engine] + (phase_oracle and engine == "Statevector")
+    # A CX tree computes the oracle's parity in log depth for a few extra gates; phase oracles have no CX to arrange
+    synthesis = st.selectbox("Oracle CX synthesis", ORACLE_SYNTHESES, disabled=phase_oracle)
+    return phase_oracle, synthesis, max_n
+
+
+def show_profiling_panel(history_key, timers):
+    history = st.session_state.setdefault(history_key, deque(maxlen=PROFILE_HISTORY))
+    records = [record for timer in timers if timer is not None for record in timer.drain()]
+    if records:
+        run = history[-1]["run"] + 1 if history else 1
+        history.extend({**record, "run": run} for record in records)
+    with st.sidebar.expander("Profiling", expanded=True):
+        if not history:
+            st.write("Nothing has been timed yet.")
+            return
+        timings = pd.DataFrame(list(history))
+        st.write("**Last run**")
+        last_run = timings[timings["run"] == timings["run"].max()]
+        st.dataframe(last_run[["stage", "wall_s", "cpu_s", "peak_bytes"]], hide_index=True)
+        st.write("**Wall time per run (s)**")
+        st.bar_chart(timings.pivot_table(index="run", columns="stage", values="wall_s", aggfunc="sum"))
+        log = "\n".join(json.dumps(record) for record in history)
+        st.download_button("Download timing log", log, file_name=f"{history_key}.jsonl", mime="application/json")
+        for timer in timers:
+            report = timer.profile_report() if timer is not None else ""
+            if report:
+                st.text(report)
+
+
+def show_circuit_diagram(circuit_key, circuit, timer=None):
+    # Drawn only once asked for; large circuits default to the oracle as one box and no barriers
+    algorithm, n = circuit_key[:2]
+    if not st.toggle("Show circuit diagram", key=f"{algorithm}_show_diagram"):
+        return
+    if n > DIAGRAM_QUBIT_LIMIT:
+        st.info(f"The circuit diagram is only drawn for up to {DIAGRAM_QUBIT_LIMIT} qubits.")
+        return
+    mode_column, fold_column, collapse_column = st.columns(3)
+    mode = mode_column.selectbox("Diagram format", list(DIAGRAM_FOLDS.keys()))
+    fold = fold_column.number_input("Fold width", 10, 500, DIAGRAM_FOLDS[mode])
+    collapse = collapse_column.checkbox("Collapse oracle and barriers", value=n > COLLAPSE_ORACLE_ABOVE)
+    if collapse:
+        circuit = keyed_circuit(circuit_key, collapse_oracle=True)
+    with timed_stage(timer, "circuit_drawer"):
+        gallery = get_gallery()
+        diagram = None
+        if gallery is not None and mode == "text" and fold == DIAGRAM_FOLDS["text"]:
+            diagram = gallery.diagram(circuit_key, collapsed=collapse)
+        if diagram is None:
+            diagram = cached_diagram(circuit, mode, fold, plot_barriers=not collapse)
+    if mode == "text":
+        st.code(diagram, language=None)
+    else:
+        st.image(diagram, use_column_width=True)
+
+
+def show_oracle_check(algorithm, n, spec):
+    if n > EQUIVALENCE_QUBIT_LIMIT:
+        st.caption(f"The phase oracle is checked against the ancilla oracle for up to {EQUIVALENCE_QUBIT_LIMIT} qubits.")
+    elif phase_oracle_equivalent(algorithm, n, spec):
+        st.caption(f"✓ The phase oracle matches the ancilla oracle on all {2**n} inputs.")
+    else:
+        st.error("The phase oracle does not match the ancilla oracle for this function.")
+
+
+def show_results(answer, timer=None):
+    # A native chart of the top outcomes: no Matplotlib figure to leak, and a fixed size for any n
+    with timed_stage(timer, "histogram"):
+        top = top_counts(answer, HISTOGRAM_TOP_K)
+        chart = pd.DataFrame({"outcome": list(top.keys()), "count": list(top.values())})
+    st.subheader("Result Counts:")
+    st.write(f"{len(answer)} distinct outcomes over {sum(answer.values())} shots")
+    st.dataframe(chart, hide_index=True)
+    st.subheader("Histogram:")
+    st.bar_chart(chart, x="outcome", y="count")
+
+
+def show_batch_results(labels, answers, per_row=3, timer=None):
+    # Counts of every circuit in the batch, side by side
+    for start in range(0, len(answers), per_row):
+        columns = st.columns(per_row)
+        for column, label, answer in zip(columns, labels[start:start + per_row], answers[start:start + per_row]):
+            with column:
+                st.write(f"**{label}**")
+                show_results(answer, timer)
+
+
+def show_shot_analytics(record, timer=None):
+    # Statistics over every recorded shot, then the first shots in the order they were measured
+    stats = record.stats
+    with timed_stage(timer, "shot_analytics"):
+        marginals = pd.DataFrame({"qubit": [f"q{qubit}" for qubit in range(stats.n)], "P(1)": stats.marginals()})
+        distances = pd.DataFrame({"distance": range(stats.n + 1), "shots": stats.hamming})
+    expected = format(stats.expected, f"0{stats.n}b")
+    st.subheader("Shot Analytics:")
+    rate_column, distance_column = st.columns(2)
+    rate_column.metric("Success rate", f"{stats.success_rate():.4f}")
+    distance_column.metric(f"Mean Hamming distance from {expected}", f"{stats.mean_hamming():.3f}")
+    st.write("Probability of measuring 1 on each qubit")
+    st.bar_chart(marginals, x="qubit", y="P(1)")
+    st.write(f"Hamming distance from {expected}")
+    st.bar_chart(distances, x="distance", y="shots")
+    if record.memory is None:
+        st.caption(f"Individual shots are only kept for runs of up to {MEMORY_KEEP_SHOTS} shots.")
+        return
+    first = record.memory[:SHOT_PREVIEW]
+    st.write(f"First {len(first)} of {len(record.memory)} shots")
+    st.dataframe(
+        pd.DataFrame({"shot": range(len(first)), "outcome": [format(int(value), f"0{stats.n}b") for value in first]}),
+        hide_index=True,
+    )
+    buffer = io.BytesIO()
+    np.save(buffer, record.memory)
+    st.download_button(
+        "Download shots (.npy)", buffer.getvalue(), file_name=f"{stats.algorithm}_shots.npy", mime="application/octet-stream"
+    )
+
+
+def show_throughput(rows):
+    st.subheader("Simulator Throughput:")
+    throughput = pd.DataFrame(rows)
+    st.dataframe(throughput, hide_index=True)
+    st.bar_chart(throughput, x="provider", y="shots_per_s")
+    speedup = rows[1]["shots_per_s"] / rows[0]["shots_per_s"]
+    st.write(f"{rows[1]['backend']} ran {speedup:.1f}x the shots per second of {rows[0]['backend']}.")
+
+
+def show_stream(stream, timer=None, final=False):
+    counts = stream.snapshot()
+    p, low, high = stream.success()
+    st.progress(stream.shots_done / stream.shots, text=f"{stream.shots_done} of {stream.shots} shots")
+    estimate_column, interval_column = st.columns(2)
+    estimate_column.metric("Estimated success probability", f"{p:.3f}")
+    interval_column.metric("95% confidence interval", f"{low:.3f} to {high:.3f}")
+    if stream.stopped_early:
+        st.success(f"Stopped early after {stream.shots_done} shots: the leading outcome is statistically settled.")
+    if not final and counts:
+        show_results(counts, timer)
+
+
+def show_job(job_id, labels=None, timer=None, render=None, stream=None):
+    # Returns True while the job is still queued or running, so the page knows to poll again
+    job = get_job_pool().get(job_id)
+    if job is None:
+        return False
+    if job.status == DONE:
+        st.status(f"Job {job_id} finished in {job.elapsed:.2f}s", state="complete")
+        if stream is not None:
+            show_stream(stream, final=True)
+        if render is not None:
+            render(job.future.result())
+        elif isinstance(job.future.result(), ShotRecord):
+            show_results(job.future.result().counts(), timer)
+            show_shot_analytics(job.future.result(), timer)
+        elif labels is None:
+            show_results(job.future.result(), timer)
+        else:
+            show_batch_results(labels, job.future.result(), timer=timer)
+        return False
+    if job.status == ERROR:
+        with st.status(f"Job {job_id} failed after {job.elapsed:.2f}s", state="error"):
+            st.exception(job.future.exception())
+        return False
+    if job.status == QUEUED:
+        position = get_job_pool().queue_position(job_id)
+        st.status(f"Job {job_id} queued at position {position}, waiting for {job.elapsed:.1f}s", state="running")
+    else:
+        st.status(f"Job {job_id} running for {job.elapsed - job.wait_time:.1f}s", state="running")
+        if stream is not None:
+            show_stream(stream)
+    return True
+
+
+def show_hardware_job(job_id, labels=None):
+    # Returns True while the provider still has the job queued or running; results are fetched once it is done
+    jobs = get_hardware_jobs()
+    record = jobs.get(job_id)
+    if record is None:
+        return False
+    try:
+        status = jobs.status(job_id)
+        counts = jobs.result(job_id) if status == DONE else None
+    except Exception as error:  # polls and results come from the provider too, so they fail the same ways
+        with st.status(f"Hardware job {job_id} on {record['backend']} could not be polled", state="error"):
+            st.exception(error)
+        return False
+    elapsed = jobs.elapsed(job_id)
+    if status == DONE:
+        st.status(f"Hardware job {job_id} on {record['backend']} finished in {elapsed:.1f}s", state="complete")
+        if labels is None:
+            show_results(counts[0])
+        else:
+            show_batch_results(labels, counts)
+        return False
+    if status == ERROR:
+        st.status(f"Hardware job {job_id} on {record['backend']} failed after {elapsed:.1f}s", state="error")
+        return False
+    st.status(f"Hardware job {job_id} {status.lower()} on {record['backend']} for {elapsed:.0f}s", state="running")
+    return True
+
+
+def show_queue_metrics():
+    metrics = get_job_pool().metrics()
+    with st.sidebar.expander("Simulator Queue"):
+        st.metric("Jobs waiting", f"{metrics['queue_depth']} / {metrics['max_queued']}")
+        st.metric("Jobs running", f"{metrics['running']} / {metrics['max_concurrent']}")
+        st.metric("Mean wait", f"{metrics['mean_wait_s']:.2f}s")
+        st.metric("95th percentile wait", f"{metrics['p95_wait_s']:.2f}s")
+        st.metric("Rejected submissions", metrics["rejected"])
+
+
+def aer_options_form():
+    # Defaults give every concurrent job of the shared pool an equal share of the host's cores
+    defaults = default_aer_options()
+    cpu_count = os.cpu_count() or 1
+    with st.expander("Aer Options"):
+        threads_column, shots_column = st.columns(2)
+        threads = threads_column.number_input("Max parallel threads", 1, cpu_count, defaults["max_parallel_threads"])
+        shots = shots_column.number_input("Max parallel shots", 1, cpu_count, defaults["max_parallel_shots"])
+        precision_column, threshold_column = st.columns(2)
+        precision = precision_column.selectbox("Precision", AER_PRECISIONS)
+        threshold = threshold_column.number_input(
+            "Statevector parallel threshold (qubits)", 1, 63, defaults["statevector_parallel_threshold"]
+        )
+    return {
+        "max_parallel_threads": threads,
+        "max_parallel_shots": shots,
+        "precision": precision,
+        "statevector_parallel_threshold": threshold,
+    }
+
+
+def transpiler_options_form():
+    defaults = DEFAULT_TRANSPILE_OPTIONS
+    with st.expander("Transpiler Options"):
+        level_column, coupling_column = st.columns(2)
+        level = level_column.select_slider("Optimization level", OPTIMIZATION_LEVELS, value=defaults["optimization_level"])
+        coupling = coupling_column.selectbox(
+            "Coupling map", COUPLING_PRESETS, index=COUPLING_PRESETS.index(defaults["coupling"])
+        )
+    return {"optimization_level": level, "coupling": coupling}
+
+
+def show_transpile_report(circuit_key, backend, transpile_options, timer=None):
+    # Chain and tree oracles at every optimization level, transpiled for the selected backend and coupling map
+    algorithm, n, spec = circuit_key[:3]
+    phase_oracle = "phase" in circuit_key[3:]
+    if not st.toggle("Show transpile report", key=f"{algorithm}_show_transpile_report"):
+        return
+    # The gallery has both syntheses at every level for its own backend and no coupling constraint
+    gallery = get_gallery()
+    rows = None
+    if gallery is not None and not phase_oracle and transpile_options["coupling"] == DEFAULT_TRANSPILE_OPTIONS["coupling"]:
+        rows = gallery.transpile_report((algorithm, n, spec), backend.name)
+    if rows is None:
+        rows = []
+        with timed_stage(timer, "transpile_report"):
+            for synthesis in ["chain"] if phase_oracle else ORACLE_SYNTHESES:
+                circuit = keyed_circuit((algorithm, n, spec, *oracle_style_key(phase_oracle, synthesis)))
+                for level in OPTIMIZATION_LEVELS:
+                    report = transpile_report(circuit, backend, {**transpile_options, "optimization_level": level})
+                    rows.append({"oracle": "phase" if phase_oracle else synthesis, "optimization_level": level, **report})
+    report = pd.DataFrame(rows)
+    st.dataframe(report, hide_index=True)
+    st.write("**Depth after transpiling**")
+    st.bar_chart(report.pivot(index="optimization_level", columns="oracle", values="depth_after"))
+
+
+def show_simulation_plan(circuit, shots=1024, noise=None, cache_key=None, transpile_options=None):
+    # The Auto engine's or the noise model's choice is shown before running, and runs over the memory budget are refused.
+    # Noisy runs are planned on the circuit routed onto the device, which can use more qubits than the circuit
+    try:
+        if noise is None:
+            plan = plan_simulation(circuit, shots)
+        else:
+            plan = plan_noisy([circuit], noise, shots, transpile_options, [cache_key])[1]
+    except MemoryBudgetError as error:
+        st.error(str(error))
+        return False
+    show = st.warning if plan.downgraded else st.info
+    if noise is None:
+        show(f"Auto engine: Aer {plan.describe()}")
+    else:
+        show(f"Noisy simulation with the {noise} noise model: Aer {plan.describe()}")
+    return True
+
+
+def batch_plan_error(batch, settings):
+    # The batch runs as one job, so it is planned as a whole; returns why it would be refused, or None
+    if settings.provider == ANALYTIC_PROVIDER or (settings.engine != "Auto" and settings.noise is None):
+        return None
+    circuits = [keyed_circuit(key) for key in batch.keys]
+    try:
+        if settings.noise is None:
+            plan_simulation(circuits, settings.shots)
+        else:
+            plan_noisy(circuits, settings.noise, settings.shots, settings.transpile_options, list(batch.keys))
+    except MemoryBudgetError as error:
+        return str(error)
+    return None
+
+
+def run_settings_form(circuit, circuit_key, engine, timer=None):
+    # Provider, backend, noise, transpiler and shot settings for the circuit on the page
+    n = circuit_key[1]
+    provider = st.selectbox("Select Provider", [*PROVIDERS, ANALYTIC_PROVIDER])
+    if provider == ANALYTIC_PROVIDER:
+        backend = st.selectbox("Select Backend", [ANALYTIC_BACKEND_NAME])
+    else:
+        backend = st.selectbox("Select Backend", backend_names(provider))
+
+    aer_options = aer_options_form() if provider == "Aer" else None
+
+    # Noise models of real devices, for answers that look like hardware rather than the textbook
+    noise = None
+    transpile_options = None
+    if provider != ANALYTIC_PROVIDER:
+        noise_choice = st.selectbox("Noise model", [IDEAL, *noise_devices(circuit.num_qubits)])
+        noise = None if noise_choice == IDEAL else noise_choice
+        transpile_options = transpiler_options_form()
+        show_transpile_report(circuit_key, get_provider(provider).get_backend(backend), transpile_options, timer)
+
+    shots_column, chunks_column = st.columns(2)
+    shots = shots_column.select_slider("Shots", SHOT_OPTIONS, value=1024)
+    streaming = st.checkbox("Stream shots in chunks and show results as they arrive")
+    chunks = chunks_column.number_input("Chunks", 2, 256, 16, disabled=not streaming)
+    early_stop = st.checkbox("Stop early once the leading outcome is settled", value=True, disabled=not streaming)
+    # Off by default: a stored run replays the same sampled counts on every click, in every session.
+    # Streamed chunks are always simulated: reusing one stored chunk would repeat the same counts
+    use_store = st.checkbox("Reuse stored results for identical runs", value=False, disabled=streaming)
+    # Shots are packed one integer each, so this needs at most MEMORY_MAX_BITS measured qubits
+    record_shots = st.checkbox(
+        "Record every shot for per-shot analytics (success rate, Hamming distance, per-qubit marginals)",
+        disabled=streaming or n > MEMORY_MAX_BITS,
+    ) and not streaming and n <= MEMORY_MAX_BITS
+
+    runnable = True
+    if (engine == "Auto" or noise is not None) and provider != ANALYTIC_PROVIDER:
+        runnable = show_simulation_plan(circuit, shots, noise, circuit_key, transpile_options)
+    return RunSettings(
+        provider, backend, engine, aer_options, noise, transpile_options, shots, streaming, chunks, early_stop, use_store,
+        record_shots, runnable,
+    )
+
+
+# Jobs run on the shared worker pool; these return the job id instead of blocking the page
+def run_on_simulator(
+    circuit, provider, backend, engine="Statevector", cache_key=None, timer=None, options=None, shots=1024,
+    use_store=False, transpile_options=None, noise=None,
+):
+    return get_job_pool().submit(
+        RunCircuit, circuit, provider, backend, shots=shots, engine=engine, cache_key=cache_key, timer=timer, options=options,
+        use_store=use_store, transpile_options=transpile_options, noise=noise,
+    )
+
+
+def run_batch_on_simulator(
+    circuits, provider, backend, engine="Statevector", cache_keys=None, timer=None, options=None, shots=1024,
+    use_store=False, transpile_options=None, noise=None,
+):
+    return get_job_pool().submit(
+        RunCircuits, circuits, provider, backend, shots=shots, engine=engine, cache_keys=cache_keys, timer=timer,
+        options=options, use_store=use_store, transpile_options=transpile_options, noise=noise,
+    )
+
+
+def run_shots_on_simulator(
+    circuit, provider, backend, algorithm, spec, engine="Statevector", cache_key=None, timer=None, options=None, shots=1024,
+    transpile_options=None, noise=None,
+):
+    # Every shot comes back packed into a NumPy array and is summarised as it arrives
+    return get_job_pool().submit(
+        RunShots, circuit, provider, backend, algorithm, circuit.num_clbits, spec, shots=shots, engine=engine,
+        cache_key=cache_key, timer=timer, options=options, transpile_options=transpile_options, noise=noise,
+    )
+
+
+def run_streaming_on_simulator(
+    circuit, provider, backend, stream, chunks, engine, cache_key, options, early_stop, transpile_options=None, noise=None
+):
+    # Counts land in stream chunk by chunk, so the page can chart them while the job is still running
+    return get_job_pool().submit(
+        RunStreaming, circuit, provider, backend, stream, chunks=chunks, engine=engine, cache_key=cache_key,
+        options=options, early_stop=early_stop, transpile_options=transpile_options, noise=noise,
+    )
+
+
+def run_throughput_comparison(circuit, aer_options=None, cache_key=None, shots=1024):
+    return get_job_pool().submit(compare_throughput, circuit, shots=shots, aer_options=aer_options, cache_key=cache_key)
+
+
+def run_from_gallery(counts):
+    # Precomputed counts still go through the job pool, so they are shown like any finished run
+    return get_job_pool().submit(lambda: counts)
+
+
+def run_on_analytic_sampler(algorithm, n, spec, shots=1024, record_shots=False):
+    # The outcome of every DJ and BV oracle is known exactly, so no circuit is simulated
+    if record_shots:
+        return get_job_pool().submit(sample_shot_record, algorithm, n, spec, shots=shots)
+    return get_job_pool().submit(run_analytic, n, spec, shots=shots)
+
+
+def run_batch_on_analytic_sampler(n, specs, shots=1024):
+    return get_job_pool().submit(run_analytic_batch, n, specs, shots=shots)
+
+
+def run_on_real_backend(circuits, session, backend, shots=1024, cache_keys=None, transpile_options=None):
+    # Submits one batched job and returns the provider's job id; the page polls it instead of waiting
+    return SubmitToHardware(circuits, session, backend, shots, cache_keys, transpile_options)
+
+
+def submit_run(circuit_key, settings, timer=None):
+    # The single-circuit run path behind "Run on Simulator": returns (job id, stream or None)
+    algorithm, n, spec = circuit_key[:3]
+    if settings.provider == ANALYTIC_PROVIDER:
+        return run_on_analytic_sampler(algorithm, n, spec, settings.shots, settings.record_shots), None
+    circuit = keyed_circuit(circuit_key, timer)
+    provider = get_provider(settings.provider)
+    if settings.streaming:
+        stream = StreamingCounts(algorithm, n, spec, settings.shots)
+        job_id = run_streaming_on_simulator(
+            circuit, provider, settings.backend, stream, settings.chunks, settings.engine, circuit_key,
+            settings.aer_options, settings.early_stop, settings.transpile_options, settings.noise,
+        )
+        return job_id, stream
+    if settings.record_shots:
+        job_id = run_shots_on_simulator(
+            circuit, provider, settings.backend, algorithm, spec, settings.engine, circuit_key, timer, settings.aer_options,
+            settings.shots, settings.transpile_options, settings.noise,
+        )
+        return job_id, None
+    reference = gallery_counts(
+        [circuit_key], settings.backend, settings.shots, settings.engine, settings.transpile_options, settings.noise
+    )
+    if reference is not None:
+        return run_from_gallery(reference[0]), None
+    job_id = run_on_simulator(
+        circuit, provider, settings.backend, settings.engine, circuit_key, timer, settings.aer_options, settings.shots,
+        settings.use_store, settings.transpile_options, settings.noise,
+    )
+    return job_id, None
+
+
+def submit_batch(n, batch, settings, timer=None):
+    # The batch run path: every oracle of the batch in one backend job
+    if settings.provider == ANALYTIC_PROVIDER:
+        return run_batch_on_analytic_sampler(n, batch.specs, settings.shots)
+    reference = gallery_counts(
+        batch.keys, settings.backend, settings.shots, settings.engine, settings.transpile_options, settings.noise
+    )
+    if reference is not None:
+        return run_from_gallery(reference)
+    return run_batch_on_simulator(
+        [keyed_circuit(key, timer) for key in batch.keys], get_provider(settings.provider), settings.backend,
+        settings.engine, batch.keys, timer, settings.aer_options, settings.shots, settings.use_store,
+        settings.transpile_options, settings.noise,
+    )
+
+
+def run_section(circuit_key, settings, batch, batch_button, batch_error=None, caption=None):
+    # Run buttons and the results of the last run; returns True while a job is still pending.
+    # batch_error, when set, is shown instead of running the batch; caption is written above single-circuit results
+    algorithm, n = circuit_key[:2]
+    job_state, compare_state = f"{algorithm}_job", f"{algorithm}_compare"
+    # Every button follows the plan: a refused batch disables the batch button, a refused circuit all three
+    batch_refusal = None if batch_error is not None or not settings.runnable else batch_plan_error(batch, settings)
+    if batch_refusal is not None:
+        st.error(f"{batch_button}: {batch_refusal}")
+    run_column, run_batch_column, compare_column = st.columns(3)
+    try:
+        if run_column.button("Run on Simulator", disabled=not settings.runnable):
+            job_timer = new_timer(algorithm)
+            job_id, stream = submit_run(circuit_key, settings, job_timer)
+            st.session_state[job_state] = (job_id, circuit_key, None, job_timer, stream)
+        if run_batch_column.button(batch_button, disabled=not settings.runnable or batch_refusal is not None):
+            if batch_error is not None:
+                st.error(batch_error)
+            else:
+                job_timer = new_timer(algorithm)
+                job_id = submit_batch(n, batch, settings, job_timer)
+                st.session_state[job_state] = (job_id, batch.key, batch.labels, job_timer, None)
+        # Same circuit on BasicAer and Aer, timing only the simulation
+        compare_disabled = n > ENGINE_QUBIT_LIMITS["Statevector"] or not settings.runnable
+        if compare_column.button("Compare BasicAer vs Aer Throughput", disabled=compare_disabled):
+            job_id = run_throughput_comparison(keyed_circuit(circuit_key), settings.aer_options, circuit_key, settings.shots)
+            st.session_state[compare_state] = (job_id, circuit_key)
+    except (QueueFullError, MemoryBudgetError) as error:
+        st.error(str(error))
+
+    # Results stay on the page until the circuit changes or another run is started
+    job_pending = False
+    job = st.session_state.get(job_state)
+    if job is not None and job[1] in (circuit_key, batch.key):
+        if caption is not None and job[1] == circuit_key:
+            st.write(caption)
+        job_pending = show_job(job[0], job[2], job[3], stream=job[4])
+
+    compare = st.session_state.get(compare_state)
+    if compare is not None and compare[1] == circuit_key:
+        job_pending = show_job(compare[0], render=show_throughput) or job_pending
+    return job_pending
+
+
+def hardware_section(circuit_key, settings, batch, batch_button, batch_disabled=False):
+    # Real devices, or snapshots of them simulated locally; one provider per API key is shared by the whole server.
+    # Returns True while a hardware job is still pending
+    algorithm = circuit_key[0]
+    job_state = f"{algorithm}_hardware_job"
+    if st.toggle("Run on quantum hardware", key=f"{algorithm}_show_hardware"):
+        hardware_provider = st.selectbox("Select Hardware Provider", list(HARDWARE_PROVIDERS.keys()))
+        api_key = st.text_input(
+            "IBM Quantum API Key", type="password", disabled=hardware_provider == FAKE_PROVIDER_NAME
+        )
+        if hardware_provider == FAKE_PROVIDER_NAME or api_key:
+            try:
+                with st.spinner(f"Connecting to {hardware_provider}..."):
+                    session = get_hardware_session(hardware_provider, api_key)
+                    hardware_backends = session.backend_names()
+                hardware_backend = st.selectbox("Select Device", hardware_backends)
+                submit_column, submit_batch_column = st.columns(2)
+                if submit_column.button("Submit to Hardware"):
+                    job_id = run_on_real_backend(
+                        [keyed_circuit(circuit_key)], session, hardware_backend, settings.shots, [circuit_key],
+                        settings.transpile_options,
+                    )
+                    st.session_state[job_state] = (job_id, circuit_key, None)
+                if submit_batch_column.button(batch_button, disabled=batch_disabled):
+                    job_id = run_on_real_backend(
+                        [keyed_circuit(key) for key in batch.keys], session, hardware_backend, settings.shots, batch.keys,
+                        settings.transpile_options,
+                    )
+                    st.session_state[job_state] = (job_id, batch.key, batch.labels)
+            except Exception as error:  # authentication, network and device errors all come from the provider
+                st.exception(error)
+
+    job = st.session_state.get(job_state)
+    if job is not None and job[1] in (circuit_key, batch.key):
+        return show_hardware_job(job[0], job[2])
+    return False
+
+
+def finish_page(algorithm, timer, job_pending, hardware_pending):
+    # Sidebar panels, then keep polling while a submitted job is still queued or running
+    show_queue_metrics()
+    job = st.session_state.get(f"{algorithm}_job")
+    job_timer = job[3] if job is not None and not job_pending else None
+    show_profiling_panel(f"{algorithm}_timings", [timer, job_timer])
+    if job_pending or hardware_pending:
+        time.sleep(JOB_POLL_INTERVAL if job_pending else HARDWARE_POLL_INTERVAL)
+        st.rerun()
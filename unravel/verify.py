@@ -0,0 +1,63 @@
+# ########## Run Path Verification ##########
+import itertools
+
+from unravel.algorithms import ORACLE_KINDS, build_circuit, oracle_spec
+from unravel.analytic import ANALYTIC_BACKEND_NAME
+from unravel.execution import run_algorithm
+from unravel.oracles import oracle_mask
+
+
+# Oracle variants every spec is run with, as (phase_oracle, synthesis)
+VERIFY_VARIANTS = [(False, "chain"), (False, "tree"), (True, "chain")]
+VERIFY_ENGINES = ["Statevector", "Stabilizer"]
+
+
+def mask_spec(n, spec):
+    # The same oracle written with integer masks instead of bitstrings
+    mask = oracle_mask(n, spec)
+    if mask.kind == "balanced":
+        return ("balanced", mask.x_mask, mask.parity_mask)
+    if mask.kind == "bv":
+        return ("bv", mask.parity_mask)
+    return spec
+
+
+def verify_cases(algorithms, n_values, seeds, engines=VERIFY_ENGINES):
+    # (algorithm, n, spec, phase_oracle, synthesis, engine); constant oracles ignore the seed, so they appear once
+    specs = {}
+    for algorithm, n, seed in itertools.product(algorithms, n_values, seeds):
+        for oracle in ORACLE_KINDS[algorithm]:
+            specs[(algorithm, n, oracle_spec(algorithm, oracle, n, seed))] = None
+    return [
+        (algorithm, n, spec, phase_oracle, synthesis, engine)
+        for algorithm, n, spec in specs
+        for phase_oracle, synthesis in VERIFY_VARIANTS
+        for engine in engines
+    ]
+
+
+def verify_case(case, shots=256):
+    # Problems found with one case: its counts must match the analytic sampler's exactly (DJ and BV are
+    # deterministic without noise), and the bitmask form of its spec must build the same circuit
+    algorithm, n, spec, phase_oracle, synthesis, engine = case
+    options = {"phase_oracle": phase_oracle, "synthesis": synthesis}
+    problems = []
+    expected = run_algorithm(algorithm, n, spec, shots, backend_name=ANALYTIC_BACKEND_NAME)["counts"]
+    result = run_algorithm(algorithm, n, spec, shots, engine, **options)
+    if result["counts"] != expected:
+        problems.append(f"measured {result['counts']}, the analytic sampler gives {expected}")
+    if build_circuit(algorithm, n, mask_spec(n, spec), **options) != build_circuit(algorithm, n, spec, **options):
+        problems.append(f"the bitmask spec {mask_spec(n, spec)} builds a different circuit")
+    return problems
+
+
+def verify_run_paths(cases, shots=256, progress=None):
+    # [(case, problems)] for every case that failed
+    failures = []
+    for index, case in enumerate(cases):
+        problems = verify_case(case, shots)
+        if problems:
+            failures.append((case, problems))
+        if progress is not None:
+            progress(index + 1, len(cases), case, problems)
+    return failures
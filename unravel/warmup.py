@@ -0,0 +1,42 @@
+# ########## Simulator Warm-up ##########
+import logging
+import os
+import threading
+import time
+
+
+logger = logging.getLogger("unravel.warmup")
+
+# Set UNRAVEL_WARMUP=0 to skip the background warm-up, e.g. on very small hosts
+WARMUP_ENABLED = os.environ.get("UNRAVEL_WARMUP", "1") != "0"
+
+
+def warm_up():
+    # Load every simulator provider, Aer, the transpiler and matplotlib, and push one tiny circuit
+    # through each path so the first click on a page does not pay for imports and first-call setup.
+    # Everything is imported here, inside the worker thread, so importing this module stays cheap
+    start = time.perf_counter()
+    from unravel.algorithms import build_circuit
+    from unravel.cache import render_circuit
+    from unravel.execution import PROVIDERS, RunCircuit, backend_names, get_provider
+    from unravel.stabilizer import run_stabilizer
+
+    circuit = build_circuit("bv", 2, ("bv", "11"))
+    for provider_name in PROVIDERS:
+        provider = get_provider(provider_name)
+        for backend_name in backend_names(provider_name):
+            RunCircuit(circuit, provider, backend_name, shots=16)
+    run_stabilizer(circuit, shots=16)
+    render_circuit(circuit)
+    elapsed = time.perf_counter() - start
+    logger.info("Simulator warm-up finished in %.2f s", elapsed)
+    return elapsed
+
+
+def start_warm_up():
+    # Runs in a daemon thread so the Home page renders immediately; returns None when disabled
+    if not WARMUP_ENABLED:
+        return None
+    thread = threading.Thread(target=warm_up, name="unravel-warmup", daemon=True)
+    thread.start()
+    return thread